@@ -3,9 +3,10 @@ from typing import Any, Dict, List, Optional
 from .challenges import maybe_challenge_play
 from .conditions import goal_satisfied, parse_simple_condition
 from .effects import resolve_effect
-from .game_helpers import can_player_attack_monster
+from .game_helpers import can_player_attack_monster, collect_party_class_counts
 from .models import ActionCandidate, Engine, GameState, Policy
 from .rolls import resolve_roll_event
+from .utils import first_in_order
 
 
 def play_card_from_hand(
@@ -15,7 +16,7 @@ def play_card_from_hand(
     card_id: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
     cost_override: Optional[int] = None,
     allow_challenge: bool = True,
 ):
@@ -27,16 +28,18 @@ def play_card_from_hand(
         return
 
     meta = engine.card_meta.get(card_id, {})
-    ctype = str(meta.get("type", "unknown")).strip().lower()
+    ctype = engine.card_types.get(card_id, "unknown")
 
     p.hand.remove(card_id)
-    log.append(f"[P{pid}] PLAY {card_id} ({meta.get('name','?')} / {ctype}) cost={cost}")
+    if log is not None:
+        log.append(f"[P{pid}] PLAY {card_id} ({meta.get('name','?')} / {ctype}) cost={cost}")
 
     if allow_challenge:
         cancelled = maybe_challenge_play(state, engine, pid, card_id, rng, policy, log)
         if cancelled:
             state.discard_pile.append(card_id)
-            log.append(f"[P{pid}] play of {card_id} cancelled -> discard")
+            if log is not None:
+                log.append(f"[P{pid}] play of {card_id} cancelled -> discard")
             p.action_points -= cost
             return
 
@@ -44,10 +47,11 @@ def play_card_from_hand(
 
     if ctype == "hero":
         p.party.append(card_id)
-        log.append(f"[P{pid}] -> entered party: {card_id}:{meta.get('name','?')}")
+        if log is not None:
+            log.append(f"[P{pid}] -> entered party: {card_id}:{meta.get('name','?')}")
 
     elif ctype == "item":
-        subtype = str(meta.get("subtype", "")).strip().lower()
+        subtype = engine.card_subtypes.get(card_id, "")
         is_cursed = subtype == "cursed"
         if is_cursed:
             candidates: List[tuple[int, int]] = []
@@ -60,35 +64,40 @@ def play_card_from_hand(
                     candidates.append((opp.pid, hero_id))
             if not candidates:
                 state.discard_pile.append(card_id)
-                log.append(f"[P{pid}] WARN played cursed item with no valid opponent hero; discarded {card_id}")
+                if log is not None:
+                    log.append(f"[P{pid}] WARN played cursed item with no valid opponent hero; discarded {card_id}")
             else:
                 target_pid, target_hero = sorted(
                     candidates,
                     key=lambda pair: (-policy.score_card_value(pair[1], engine), pair[0], pair[1]),
                 )[0]
                 target_player = state.players[target_pid]
-                target_player.hero_items[target_hero].append(card_id)
+                target_player.hero_items.setdefault(target_hero, []).append(card_id)
                 attached_hero = target_hero
-                log.append(
-                    f"[P{pid}] -> attached cursed item {card_id}:{meta.get('name','?')} "
-                    f"to P{target_pid} hero {target_hero}:{engine.card_meta.get(target_hero, {}).get('name','?')}"
-                )
+                if log is not None:
+                    log.append(
+                        f"[P{pid}] -> attached cursed item {card_id}:{meta.get('name','?')} "
+                        f"to P{target_pid} hero {target_hero}:{engine.card_names.get(target_hero, '?')}"
+                    )
         else:
             if not p.party:
                 state.discard_pile.append(card_id)
-                log.append(f"[P{pid}] WARN played item with no heroes; discarded {card_id}")
+                if log is not None:
+                    log.append(f"[P{pid}] WARN played item with no heroes; discarded {card_id}")
             else:
                 target_hero = policy.choose_item_attach_target(p.party, engine, p.hero_items)
                 if target_hero is None:
                     state.discard_pile.append(card_id)
-                    log.append(f"[P{pid}] WARN played item with no valid hero; discarded {card_id}")
+                    if log is not None:
+                        log.append(f"[P{pid}] WARN played item with no valid hero; discarded {card_id}")
                 else:
-                    p.hero_items[target_hero].append(card_id)
+                    p.hero_items.setdefault(target_hero, []).append(card_id)
                     attached_hero = target_hero
-                    log.append(
-                        f"[P{pid}] -> attached item {card_id}:{meta.get('name','?')} "
-                        f"to hero {target_hero}:{engine.card_meta.get(target_hero, {}).get('name','?')}"
-                    )
+                    if log is not None:
+                        log.append(
+                            f"[P{pid}] -> attached item {card_id}:{meta.get('name','?')} "
+                            f"to hero {target_hero}:{engine.card_names.get(target_hero, '?')}"
+                        )
 
     else:
         state.discard_pile.append(card_id)
@@ -108,16 +117,15 @@ def play_card_from_hand(
         for step in engine.effects_by_card.get(card_id, []):
             if "passive" in step.triggers() and step.effect_kind == "modify_hero_class":
                 resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
-    for step in engine.effects_by_card.get(card_id, []):
-        trig = step.triggers()
-        if "on_play" in trig or "auto" in trig or "on_activation" in trig:
-            if "on_activation" in trig and activated_hero_id is not None:
-                p.activated_heroes_this_turn.add(activated_hero_id)
-            resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
+    for step in engine.on_play_steps.get(card_id, ()):
+        if activated_hero_id is not None and "on_activation" in step.triggers():
+            p.activated_heroes_this_turn.add(activated_hero_id)
+        resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
 
     p.action_points -= cost
-    for w in ctx.get("_warnings", []):
-        log.append(f"[P{pid}] WARN {w}")
+    if log is not None:
+        for w in ctx.get("_warnings", []):
+            log.append(f"[P{pid}] WARN {w}")
 
 
 def action_draw(
@@ -126,7 +134,7 @@ def action_draw(
     pid: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     p = state.players[pid]
     if p.action_points < 1:
@@ -140,16 +148,17 @@ def action_draw(
     drawn = engine.card_meta.get(cid, {"id": cid, "type": "unknown"})
     ctx = {"drawn_card": drawn}
 
-    log.append(f"[P{pid}] ACTION draw (cost 1) -> {cid} ({drawn.get('name','?')} / {drawn.get('type','?')})")
+    if log is not None:
+        log.append(f"[P{pid}] ACTION draw (cost 1) -> {cid} ({drawn.get('name','?')} / {drawn.get('type','?')})")
     p.action_points -= 1
 
     for mid in p.captured_monsters:
-        for step in engine.monster_effects.get(mid, []):
-            if "on_draw" in step.triggers():
-                resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
+        for step in engine.monster_trigger_steps(mid, "on_draw"):
+            resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
 
-    for w in ctx.get("_warnings", []):
-        log.append(f"[P{pid}] WARN {w}")
+    if log is not None:
+        for w in ctx.get("_warnings", []):
+            log.append(f"[P{pid}] WARN {w}")
 
     return True
 
@@ -160,7 +169,7 @@ def action_activate_hero(
     pid: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
     hero_id: Optional[int] = None,
 ) -> bool:
     p = state.players[pid]
@@ -187,11 +196,12 @@ def action_activate_hero(
             seen_notes.add(note)
             activation_notes.append(note)
         note_suffix = f" - {'; '.join(activation_notes)}" if activation_notes else ""
-        if any("on_activation" in s.triggers() for s in steps):
-            log.append(
-                f"[P{pid}] ACTION activate hero (cost 1) -> {hero_id} "
-                f"({engine.card_meta.get(hero_id,{}).get('name','?')}){note_suffix}"
-            )
+        if hero_id in engine.on_activation_heroes:
+            if log is not None:
+                log.append(
+                    f"[P{pid}] ACTION activate hero (cost 1) -> {hero_id} "
+                    f"({engine.card_names.get(hero_id, '?')}){note_suffix}"
+                )
             p.action_points -= 1
 
             ctx = {"activated_hero_id": hero_id}
@@ -200,8 +210,9 @@ def action_activate_hero(
                     resolve_effect(step, state, engine, pid, ctx, rng, policy, log)
 
             p.activated_heroes_this_turn.add(hero_id)
-            for w in ctx.get("_warnings", []):
-                log.append(f"[P{pid}] WARN {w}")
+            if log is not None:
+                for w in ctx.get("_warnings", []):
+                    log.append(f"[P{pid}] WARN {w}")
             return True
 
     return False
@@ -214,7 +225,7 @@ def action_attack_monster(
     monster_id: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     p = state.players[pid]
     if p.action_points < 2:
@@ -222,30 +233,34 @@ def action_attack_monster(
     if monster_id not in state.monster_row:
         return False
     if not can_player_attack_monster(p, engine, monster_id):
-        log.append(f"[P{pid}] WARN cannot attack monster {monster_id} (requirements unmet)")
+        if log is not None:
+            log.append(f"[P{pid}] WARN cannot attack monster {monster_id} (requirements unmet)")
         return False
 
     rule = engine.monster_attack_rules.get(monster_id)
     if not rule or not rule.success_condition:
-        log.append(f"[P{pid}] WARN monster {monster_id} has no on_attacked rule/success_condition")
+        if log is not None:
+            log.append(f"[P{pid}] WARN monster {monster_id} has no on_attacked rule/success_condition")
         return False
 
     p.action_points -= 2
-    log.append(
-        f"[P{pid}] ACTION attack monster (cost 2) -> {monster_id} "
-        f"({engine.card_meta.get(monster_id,{}).get('name','?')})"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] ACTION attack monster (cost 2) -> {monster_id} "
+            f"({engine.card_names.get(monster_id, '?')})"
+        )
 
-    op, target = parse_simple_condition(rule.success_condition)
+    # Unparseable conditions have no cached goal; parse_simple_condition raises for them.
+    op, target = rule.success_goal or parse_simple_condition(rule.success_condition)
     fail_op = None
     fail_target = None
     if rule.fail_condition:
-        fail_op, fail_target = parse_simple_condition(rule.fail_condition)
+        fail_op, fail_target = rule.fail_goal or parse_simple_condition(rule.fail_condition)
     final = resolve_roll_event(
         state=state,
         engine=engine,
         roller_pid=pid,
-        roll_reason=f"monster:{engine.card_meta.get(monster_id,{}).get('name','?')}",
+        roll_reason=f"monster:{engine.card_names.get(monster_id, '?')}",
         rng=rng,
         log=log,
         policy=policy,
@@ -263,10 +278,11 @@ def action_attack_monster(
         outcome = "FAIL"
     else:
         outcome = "NO_EFFECT"
-    log.append(
-        f"[P{pid}] monster attack roll 2d6={final} -> {outcome} "
-        f"(success:{rule.success_condition} fail:{rule.fail_condition})"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] monster attack roll 2d6={final} -> {outcome} "
+            f"(success:{rule.success_condition} fail:{rule.fail_condition})"
+        )
 
     ctx = {
         "attack_roll": final,
@@ -283,18 +299,21 @@ def action_attack_monster(
         if monster_id in state.monster_row:
             state.monster_row.remove(monster_id)
             p.captured_monsters.append(monster_id)
-            log.append(f"[P{pid}] captured monster -> {monster_id}")
+            if log is not None:
+                log.append(f"[P{pid}] captured monster -> {monster_id}")
 
         if state.monster_deck:
             new_mid = state.monster_deck.pop()
             state.monster_row.append(new_mid)
-            log.append(
-                f"[SETUP] refill monster_row -> {new_mid} "
-                f"({engine.card_meta.get(new_mid,{}).get('name','?')})"
-            )
+            if log is not None:
+                log.append(
+                    f"[SETUP] refill monster_row -> {new_mid} "
+                    f"({engine.card_names.get(new_mid, '?')})"
+                )
 
-    for w in ctx.get("_warnings", []):
-        log.append(f"[P{pid}] WARN {w}")
+    if log is not None:
+        for w in ctx.get("_warnings", []):
+            log.append(f"[P{pid}] WARN {w}")
 
     return True
 
@@ -305,7 +324,7 @@ def choose_and_take_action(
     pid: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     p = state.players[pid]
     if p.action_points <= 0:
@@ -315,23 +334,22 @@ def choose_and_take_action(
     if not candidates:
         return False
 
-    scored = [
-        (policy.score_action(candidate, state, engine, pid), candidate) for candidate in candidates
-    ]
-    scored.sort(
+    scored = list(zip(policy.score_actions(candidates, state, engine, pid), candidates))
+    best_score, best_action = first_in_order(
+        scored,
         key=lambda pair: (
             -pair[0],
             pair[1].kind,
             pair[1].monster_id or 0,
             pair[1].hero_id or 0,
             pair[1].card_id or 0,
-        )
-    )
-    best_score, best_action = scored[0]
-    log.append(
-        f"[P{pid}] DECISION choose {best_action.kind} "
-        f"(score={best_score:.2f}, cost={best_action.cost})"
+        ),
     )
+    if log is not None:
+        log.append(
+            f"[P{pid}] DECISION choose {best_action.kind} "
+            f"(score={best_score:.2f}, cost={best_action.cost})"
+        )
     return apply_action_candidate(best_action, state, engine, pid, rng, policy, log)
 
 
@@ -339,22 +357,23 @@ def build_action_candidates(state: GameState, engine: Engine, pid: int) -> List[
     p = state.players[pid]
     candidates: List[ActionCandidate] = []
     if p.action_points >= 2 and state.monster_row:
+        # One class count for the whole row; the party does not change while candidates are built.
+        class_counts = collect_party_class_counts(engine, p)
         for monster_id in state.monster_row:
-            if can_player_attack_monster(p, engine, monster_id):
+            if can_player_attack_monster(p, engine, monster_id, class_counts):
                 candidates.append(ActionCandidate(kind="attack_monster", cost=2, monster_id=monster_id))
 
     if p.action_points >= 1:
         for hero_id in p.party:
             if hero_id in p.activated_heroes_this_turn:
                 continue
-            steps = engine.effects_by_card.get(hero_id, [])
-            if any("on_activation" in s.triggers() for s in steps):
+            if hero_id in engine.on_activation_heroes:
                 candidates.append(ActionCandidate(kind="activate_hero", cost=1, hero_id=hero_id))
 
     if p.action_points >= 1:
+        modifier_ids = engine.modifier_card_ids
         for card_id in p.hand:
-            meta = engine.card_meta.get(card_id, {})
-            if str(meta.get("type", "")).lower() == "modifier":
+            if card_id in modifier_ids:
                 continue
             candidates.append(ActionCandidate(kind="play_card", cost=1, card_id=card_id))
 
@@ -370,7 +389,7 @@ def apply_action_candidate(
     pid: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     if action.kind == "attack_monster" and action.monster_id is not None:
         return action_attack_monster(state, engine, pid, action.monster_id, rng, policy, log)
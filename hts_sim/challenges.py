@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from .conditions import is_challengeable_card_type
+from .conditions import CHALLENGEABLE_CARD_TYPES
 from .effects import resolve_effect
 from .models import Engine, GameState, Policy
 from .rolls import resolve_roll_event
@@ -13,13 +13,13 @@ def maybe_challenge_play(
     played_card_id: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     """
     Returns True if play is cancelled by a successful challenge.
     """
-    played_type = str(engine.card_meta.get(played_card_id, {}).get("type", "unknown")).lower()
-    if not is_challengeable_card_type(played_type):
+    # card_types is already normalized, so test it against the set directly.
+    if engine.card_types.get(played_card_id) not in CHALLENGEABLE_CARD_TYPES:
         return False
 
     challenge_pick = policy.choose_challenger(state, engine, pid_playing)
@@ -44,29 +44,31 @@ def maybe_challenge_play(
 
     for pstate in state.players:
         for mid in pstate.captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "on_challenge" in step.triggers() and (step.effect_kind or "").strip() in ("deny", "deny_challenge"):
+            for step in engine.monster_trigger_steps(mid, "on_challenge"):
+                if step.kind in ("deny", "deny_challenge"):
                     resolve_effect(step, state, engine, pstate.pid, ctx, rng, policy, log)
 
     if ctx.get("challenge.denied"):
-        log.append("[Challenge] DENIED by effect")
+        if log is not None:
+            log.append("[Challenge] DENIED by effect")
         return False
 
     challenger = state.players[challenger_pid]
     challenger.hand.remove(challenge_card_id)
     state.discard_pile.append(challenge_card_id)
 
-    log.append(
-        f"[P{challenger_pid}] CHALLENGE played {challenge_card_id} "
-        f"({engine.card_meta.get(challenge_card_id,{}).get('name','?')}) "
-        f"to challenge {played_card_id} ({engine.card_meta.get(played_card_id,{}).get('name','?')}) "
-        f"by P{pid_playing}"
-    )
+    if log is not None:
+        log.append(
+            f"[P{challenger_pid}] CHALLENGE played {challenge_card_id} "
+            f"({engine.card_names.get(challenge_card_id, '?')}) "
+            f"to challenge {played_card_id} ({engine.card_names.get(played_card_id, '?')}) "
+            f"by P{pid_playing}"
+        )
 
     for pstate in state.players:
         for mid in pstate.captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "on_challenge" in step.triggers() and (step.effect_kind or "").strip() not in ("deny", "deny_challenge"):
+            for step in engine.monster_trigger_steps(mid, "on_challenge"):
+                if step.kind not in ("deny", "deny_challenge"):
                     resolve_effect(step, state, engine, pstate.pid, ctx, rng, policy, log)
 
     r_challenger = resolve_roll_event(
@@ -90,11 +92,14 @@ def maybe_challenge_play(
         mode="maximize",
     )
 
-    log.append(f"[Challenge] P{challenger_pid} rolls {r_challenger} vs P{pid_playing} rolls {r_playing}")
+    if log is not None:
+        log.append(f"[Challenge] P{challenger_pid} rolls {r_challenger} vs P{pid_playing} rolls {r_playing}")
 
     if r_challenger > r_playing:
-        log.append("[Challenge] SUCCESS: play cancelled")
+        if log is not None:
+            log.append("[Challenge] SUCCESS: play cancelled")
         return True
 
-    log.append("[Challenge] FAIL: play continues")
+    if log is not None:
+        log.append("[Challenge] FAIL: play continues")
     return False
@@ -1,18 +1,30 @@
 import ast
+import functools
+import operator
 import re
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 ROLL_RE = re.compile(r"^\s*(?:2d6\s*)?(>=|<=|==|>|<)\s*(\d+)\s*$")
+CHECK_ROLL_RE = re.compile(r"^\s*(>=|<=|==|>|<)\s*(\d+)\s*$")
+BOOL_WORD_RE = re.compile(r"\btrue\b|\bfalse\b", re.IGNORECASE)
 SUPPORTED_BOOL_NAMES = {"true": "True", "false": "False"}
+CHALLENGEABLE_CARD_TYPES = frozenset({"hero", "item", "magic"})
+ROLL_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
 
 
 def roll_2d6(rng: "random.Random") -> int:
-    return rng.randint(1, 6) + rng.randint(1, 6)
+    return rng.randrange(1, 7) + rng.randrange(1, 7)
 
 
 def roll_2d6_detail(rng: "random.Random") -> Tuple[int, int, int]:
-    first = rng.randint(1, 6)
-    second = rng.randint(1, 6)
+    first = rng.randrange(1, 7)
+    second = rng.randrange(1, 7)
     return first, second, first + second
 
 
@@ -20,22 +32,11 @@ def check_roll(roll_value: int, cond: str) -> bool:
     """
     cond examples: '>=5', '<=7', '==9'
     """
-    m = re.match(r"^\s*(>=|<=|==|>|<)\s*(\d+)\s*$", str(cond))
+    m = CHECK_ROLL_RE.match(str(cond))
     if not m:
         raise ValueError(f"Unparseable roll_condition: {cond}")
     op, num_s = m.group(1), m.group(2)
-    target = int(num_s)
-    if op == ">=":
-        return roll_value >= target
-    if op == "<=":
-        return roll_value <= target
-    if op == "==":
-        return roll_value == target
-    if op == ">":
-        return roll_value > target
-    if op == "<":
-        return roll_value < target
-    raise ValueError(f"Unsupported operator: {op}")
+    return ROLL_OPERATORS[op](roll_value, int(num_s))
 
 
 def parse_roll_condition(cond: str) -> Optional[Tuple[str, int]]:
@@ -43,7 +44,12 @@ def parse_roll_condition(cond: str) -> Optional[Tuple[str, int]]:
     Accepts: '>=7', '<=5', '2d6>=9'
     Returns (op, target_int) or None if unparseable.
     """
-    cond = str(cond).strip()
+    return _parse_roll_text(str(cond).strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_roll_text(cond: str) -> Optional[Tuple[str, int]]:
+    # Roll conditions come from card and monster rows; match each distinct string once.
     m = ROLL_RE.match(cond)
     if not m:
         return None
@@ -58,12 +64,11 @@ def parse_simple_condition(cond: str) -> Tuple[str, int]:
 
 
 def goal_satisfied(total: int, op: str, target: int) -> bool:
-    return check_roll(total, f"{op}{target}")
-
-
-def is_challengeable_card_type(card_type: str) -> bool:
-    t = (card_type or "").strip().lower()
-    return t in ("hero", "item", "magic")
+    # Called for every candidate modifier combination; skip check_roll's format-and-reparse.
+    compare = ROLL_OPERATORS.get(op)
+    if compare is None or not isinstance(target, int) or target < 0:
+        return check_roll(total, f"{op}{target}")
+    return compare(total, target)
 
 
 def _normalize_condition_text(cond: str) -> str:
@@ -71,89 +76,139 @@ def _normalize_condition_text(cond: str) -> str:
         word = match.group(0).lower()
         return SUPPORTED_BOOL_NAMES.get(word, word)
 
-    return re.sub(r"\btrue\b|\bfalse\b", replace_bool, cond, flags=re.IGNORECASE)
+    return BOOL_WORD_RE.sub(replace_bool, cond)
 
 
-def _eval_condition_node(node: ast.AST, ctx: Dict[str, Any]) -> Any:
-    def dotted_name(n: ast.AST) -> Optional[str]:
-        if isinstance(n, ast.Name):
-            return n.id
-        if isinstance(n, ast.Attribute):
-            base = dotted_name(n.value)
-            if base:
-                return f"{base}.{n.attr}"
-        return None
+ConditionFn = Callable[[Dict[str, Any]], Any]
+
+
+def _dotted_name(n: ast.AST) -> Optional[str]:
+    if isinstance(n, ast.Name):
+        return n.id
+    if isinstance(n, ast.Attribute):
+        base = _dotted_name(n.value)
+        if base:
+            return f"{base}.{n.attr}"
+    return None
 
+
+def _raise_unsupported(message: str) -> ConditionFn:
+    # Unsupported nodes only fail when evaluated, so short-circuited branches still pass.
+    def unsupported(ctx: Dict[str, Any]) -> Any:
+        raise ValueError(message)
+
+    return unsupported
+
+
+def _compile_condition_node(node: ast.AST) -> ConditionFn:
+    """Turns a condition AST into nested closures, so evaluation skips the per-node type dispatch."""
     if isinstance(node, ast.Expression):
-        return _eval_condition_node(node.body, ctx)
+        return _compile_condition_node(node.body)
 
     if isinstance(node, ast.BoolOp):
+        values = [_compile_condition_node(v) for v in node.values]
         if isinstance(node.op, ast.And):
-            return all(bool(_eval_condition_node(v, ctx)) for v in node.values)
+            return lambda ctx: all(bool(value(ctx)) for value in values)
         if isinstance(node.op, ast.Or):
-            return any(bool(_eval_condition_node(v, ctx)) for v in node.values)
+            return lambda ctx: any(bool(value(ctx)) for value in values)
 
     if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
-        return not bool(_eval_condition_node(node.operand, ctx))
+        operand = _compile_condition_node(node.operand)
+        return lambda ctx: not bool(operand(ctx))
 
     if isinstance(node, ast.Compare):
-        left = _eval_condition_node(node.left, ctx)
-        for op, comparator in zip(node.ops, node.comparators):
-            right = _eval_condition_node(comparator, ctx)
-            if isinstance(op, ast.Eq):
-                if left != right:
-                    return False
-            elif isinstance(op, ast.NotEq):
-                if left == right:
-                    return False
-            else:
-                raise ValueError("Unsupported comparison operator")
-            left = right
-        return True
+        left_fn = _compile_condition_node(node.left)
+        comparisons = [
+            (isinstance(op, ast.Eq), isinstance(op, ast.NotEq), _compile_condition_node(comparator))
+            for op, comparator in zip(node.ops, node.comparators)
+        ]
+
+        def compare(ctx: Dict[str, Any]) -> bool:
+            left = left_fn(ctx)
+            for is_eq, is_not_eq, right_fn in comparisons:
+                right = right_fn(ctx)
+                if is_eq:
+                    if left != right:
+                        return False
+                elif is_not_eq:
+                    if left == right:
+                        return False
+                else:
+                    raise ValueError("Unsupported comparison operator")
+                left = right
+            return True
+
+        return compare
 
     if isinstance(node, ast.Name):
-        if node.id in ctx:
-            return ctx[node.id]
-        return node.id
+        name = node.id
+        return lambda ctx: ctx[name] if name in ctx else name
 
     if isinstance(node, ast.Attribute):
-        dotted = dotted_name(node)
-        if dotted and dotted in ctx:
-            return ctx[dotted]
-        base = _eval_condition_node(node.value, ctx)
-        if isinstance(base, dict):
-            return base.get(node.attr)
-        return getattr(base, node.attr, None)
+        dotted = _dotted_name(node)
+        base_fn = _compile_condition_node(node.value)
+        attr = node.attr
+
+        def attribute(ctx: Dict[str, Any]) -> Any:
+            if dotted and dotted in ctx:
+                return ctx[dotted]
+            base = base_fn(ctx)
+            if isinstance(base, dict):
+                return base.get(attr)
+            return getattr(base, attr, None)
+
+        return attribute
 
     if isinstance(node, ast.Call):
         if isinstance(node.func, ast.Attribute) and node.func.attr == "contains":
-            base = _eval_condition_node(node.func.value, ctx)
-            if base is None or len(node.args) != 1:
+            container_fn = _compile_condition_node(node.func.value)
+            needle_fn = _compile_condition_node(node.args[0]) if len(node.args) == 1 else None
+
+            def contains(ctx: Dict[str, Any]) -> bool:
+                base = container_fn(ctx)
+                if base is None or needle_fn is None:
+                    return False
+                needle = needle_fn(ctx)
+                if isinstance(needle, str):
+                    needle = needle.strip().lower()
+                if isinstance(base, dict):
+                    return needle in base
+                if isinstance(base, (list, set, tuple)):
+                    normalized = {
+                        item.strip().lower() if isinstance(item, str) else item for item in base
+                    }
+                    return needle in normalized
+                if isinstance(base, str):
+                    return str(needle) in base
                 return False
-            needle = _eval_condition_node(node.args[0], ctx)
-            if isinstance(needle, str):
-                needle = needle.strip().lower()
-            if isinstance(base, dict):
-                return needle in base
-            if isinstance(base, (list, set, tuple)):
-                normalized = {
-                    item.strip().lower() if isinstance(item, str) else item for item in base
-                }
-                return needle in normalized
-            if isinstance(base, str):
-                return str(needle) in base
-            return False
-        raise ValueError("Unsupported function call")
+
+            return contains
+        return _raise_unsupported("Unsupported function call")
 
     if isinstance(node, ast.Constant):
-        return node.value
+        value = node.value
+        return lambda ctx: value
 
-    raise ValueError("Unsupported expression node")
+    return _raise_unsupported("Unsupported expression node")
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_condition(cond: str) -> Optional[ConditionFn]:
+    # Conditions come from a small fixed set of card rows; parse and compile each distinct one once.
+    try:
+        return _compile_condition_node(ast.parse(_normalize_condition_text(cond), mode="eval"))
+    except Exception:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
 def is_condition_supported(cond: str) -> bool:
+    # Shares the compile cache; the dry run against an empty ctx is memoized on top of it.
+    compiled = _compile_condition(cond)
+    if compiled is None:
+        return False
     try:
-        _ = _eval_condition_node(ast.parse(_normalize_condition_text(cond), mode="eval"), {})
+        _ = compiled({})
     except Exception:
         return False
     return True
@@ -173,9 +228,11 @@ def eval_condition(cond: Optional[str], ctx: Dict[str, Any]) -> bool:
     if cond == "" or cond.lower() == "nan":
         return True
 
-    try:
-        parsed = ast.parse(_normalize_condition_text(cond), mode="eval")
-        return bool(_eval_condition_node(parsed, ctx))
-    except Exception:
-        ctx.setdefault("_warnings", []).append(f"UNPARSEABLE_CONDITION: {cond}")
-        return False
+    compiled = _compile_condition(cond)
+    if compiled is not None:
+        try:
+            return bool(compiled(ctx))
+        except Exception:
+            pass
+    ctx.setdefault("_warnings", []).append(f"UNPARSEABLE_CONDITION: {cond}")
+    return False
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .conditions import eval_condition, goal_satisfied, parse_simple_condition
 from .game_helpers import (
@@ -14,6 +14,8 @@ from .models import EffectStep, Engine, GameState, Policy
 from .rolls import resolve_roll_event
 from .utils import format_card_list
 
+_TYPE_FILTER_RE = re.compile(r"^type==([a-zA-Z_]\w*)$")
+
 
 def _parse_hero_class_from_notes(notes: str) -> Optional[str]:
     if not notes:
@@ -39,16 +41,20 @@ def _handle_draw(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     n = step.amount if step.amount is not None else 1
+    draw_pile = state.draw_pile
+    hand = state.players[pid].hand
     for _ in range(n):
-        if not state.draw_pile:
+        if not draw_pile:
             break
-        cid = state.draw_pile.pop()
-        state.players[pid].hand.append(cid)
-        ctx["drawn_card"] = engine.card_meta.get(cid, {"id": cid, "type": "unknown"})
-        log.append(f"[P{pid}] drew card_id={cid} ({ctx['drawn_card'].get('name','?')})")
+        cid = draw_pile.pop()
+        hand.append(cid)
+        drawn = engine.card_meta.get(cid, {"id": cid, "type": "unknown"})
+        ctx["drawn_card"] = drawn
+        if log is not None:
+            log.append(f"[P{pid}] drew card_id={cid} ({drawn.get('name','?')})")
 
 
 def _handle_discard(
@@ -59,20 +65,21 @@ def _handle_discard(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     n = step.amount if step.amount is not None else 1
     target_pid = pid
     if step.source_zone:
         zone = step.source_zone.strip().lower()
+        challenge = ctx.get("challenge", {})
         if zone == "challenge.source":
-            challenger = ctx.get("challenge", {}).get("challenger_pid")
+            challenger = challenge.get("challenger_pid")
             if challenger is None:
                 ctx.setdefault("_warnings", []).append("discard_card: missing challenge.challenger_pid")
             else:
                 target_pid = challenger
         elif zone == "challenge.target":
-            target = ctx.get("challenge", {}).get("target_pid")
+            target = challenge.get("target_pid")
             if target is None:
                 ctx.setdefault("_warnings", []).append("discard_card: missing challenge.target_pid")
             else:
@@ -85,7 +92,8 @@ def _handle_discard(
         hand.remove(chosen)
         cid = chosen
         state.discard_pile.append(cid)
-        log.append(f"[P{target_pid}] discarded card_id={cid}")
+        if log is not None:
+            log.append(f"[P{target_pid}] discarded card_id={cid}")
 
 
 def _handle_move(
@@ -96,7 +104,7 @@ def _handle_move(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if not step.source_zone or not step.dest_zone:
         ctx.setdefault("_warnings", []).append(f"MOVE_CARD_MISSING_ZONES: {step.name}")
@@ -117,7 +125,8 @@ def _handle_move(
     src.remove(chosen)
     cid = chosen
     dst.append(cid)
-    log.append(f"[P{pid}] move_card {cid} {step.source_zone} -> {step.dest_zone}")
+    if log is not None:
+        log.append(f"[P{pid}] move_card {cid} {step.source_zone} -> {step.dest_zone}")
 
 
 def _handle_steal(
@@ -128,13 +137,15 @@ def _handle_steal(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if ctx.get("protect.steal"):
-        log.append(f"[P{pid}] steal_card blocked by protection ({step.name})")
+        if log is not None:
+            log.append(f"[P{pid}] steal_card blocked by protection ({step.name})")
         return
-    opp = (pid + 1) % len(state.players)
-    opp_hand = state.players[opp].hand
+    players = state.players
+    opp = state.opponent_of[pid]
+    opp_hand = players[opp].hand
     if not opp_hand:
         return
     chosen = policy.choose_steal_card(opp_hand, engine)
@@ -142,9 +153,10 @@ def _handle_steal(
         return
     opp_hand.remove(chosen)
     cid = chosen
-    state.players[pid].hand.append(cid)
+    players[pid].hand.append(cid)
     ctx["stolen_card"] = engine.card_meta.get(cid, {"id": cid, "type": "unknown"})
-    log.append(f"[P{pid}] stole card_id={cid} from P{opp}")
+    if log is not None:
+        log.append(f"[P{pid}] stole card_id={cid} from P{opp}")
 
 
 def _resolve_party_pid(state: GameState, pid: int, zone: Optional[str]) -> Optional[int]:
@@ -168,54 +180,59 @@ def _handle_steal_hero(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if ctx.get("protect.steal"):
-        log.append(f"[P{pid}] steal_hero blocked by protection ({step.name})")
+        if log is not None:
+            log.append(f"[P{pid}] steal_hero blocked by protection ({step.name})")
         return
     source_pid = _resolve_party_pid(state, pid, step.source_zone)
     dest_pid = _resolve_party_pid(state, pid, step.dest_zone)
     if source_pid is None or dest_pid is None:
         ctx.setdefault("_warnings", []).append(f"steal_hero: unresolved source/dest {step.source_zone}->{step.dest_zone}")
         return
-    source_party = state.players[source_pid].party
+    source = state.players[source_pid]
+    dest = state.players[dest_pid]
+    source_party = source.party
     if not source_party:
         return
+    filter_expr = str(step.filter_expr).strip().lower() if step.filter_expr else ""
+    active = ctx.get("activated_hero_id")
+    destroyed = ctx.get("destroyed_hero_id")
+    if destroyed is None:
+        hero_destroyed = ctx.get("hero_destroyed")
+        if isinstance(hero_destroyed, dict):
+            destroyed = hero_destroyed.get("id")
     amount = step.amount if step.amount is not None else 1
     for _ in range(min(amount, len(source_party))):
         chosen: Optional[int] = None
-        if step.filter_expr:
-            filter_expr = str(step.filter_expr).strip().lower()
-            if filter_expr == "hero==active":
-                active = ctx.get("activated_hero_id")
-                if isinstance(active, int) and active in source_party:
-                    chosen = active
-            elif filter_expr == "hero==destroyed":
-                destroyed = ctx.get("destroyed_hero_id")
-                if destroyed is None and isinstance(ctx.get("hero_destroyed"), dict):
-                    destroyed = ctx["hero_destroyed"].get("id")
-                if isinstance(destroyed, int) and destroyed in source_party:
-                    chosen = destroyed
+        if filter_expr == "hero==active":
+            if isinstance(active, int) and active in source_party:
+                chosen = active
+        elif filter_expr == "hero==destroyed":
+            if isinstance(destroyed, int) and destroyed in source_party:
+                chosen = destroyed
         if chosen is None:
-            chosen = policy.choose_steal_hero(source_party, engine, state.players[source_pid].hero_items)
+            chosen = policy.choose_steal_hero(source_party, engine, source.hero_items)
         if chosen is None:
             return
         if chosen not in source_party:
             return
         source_party.remove(chosen)
-        state.players[dest_pid].party.append(chosen)
-        items = list(state.players[source_pid].hero_items.get(chosen, []))
+        dest.party.append(chosen)
+        items = list(source.hero_items.get(chosen, []))
         if items:
-            state.players[source_pid].hero_items[chosen] = []
-            state.players[dest_pid].hero_items[chosen].extend(items)
-        overrides = state.players[source_pid].hero_class_overrides.pop(chosen, None)
+            del source.hero_items[chosen]
+            dest.hero_items.setdefault(chosen, []).extend(items)
+        overrides = source.hero_class_overrides.pop(chosen, None)
         if overrides:
-            state.players[dest_pid].hero_class_overrides[chosen] = overrides
+            dest.hero_class_overrides[chosen] = overrides
         ctx["stolen_hero"] = engine.card_meta.get(chosen, {"id": chosen, "type": "hero"})
-        log.append(
-            f"[P{pid}] stole hero {chosen} from P{source_pid} -> P{dest_pid}"
-            f"{' (with items)' if items else ''}"
-        )
+        if log is not None:
+            log.append(
+                f"[P{pid}] stole hero {chosen} from P{source_pid} -> P{dest_pid}"
+                f"{' (with items)' if items else ''}"
+            )
 
 
 def _transfer_hero(
@@ -224,26 +241,28 @@ def _transfer_hero(
     source_pid: int,
     dest_pid: int,
     hero_id: int,
-    log: List[str],
+    log: Optional[List[str]],
     label: str,
 ) -> bool:
     source = state.players[source_pid]
     dest = state.players[dest_pid]
-    if hero_id not in source.party:
+    try:
+        source.party.remove(hero_id)
+    except ValueError:
         return False
-    source.party.remove(hero_id)
     dest.party.append(hero_id)
     items = list(source.hero_items.get(hero_id, []))
     if items:
-        source.hero_items[hero_id] = []
-        dest.hero_items[hero_id].extend(items)
+        del source.hero_items[hero_id]
+        dest.hero_items.setdefault(hero_id, []).extend(items)
     overrides = source.hero_class_overrides.pop(hero_id, None)
     if overrides:
         dest.hero_class_overrides[hero_id] = overrides
-    log.append(
-        f"[P{source_pid}] {label} hero {hero_id}:{engine.card_meta.get(hero_id,{}).get('name','?')} -> P{dest_pid}"
-        f"{' (with items)' if items else ''}"
-    )
+    if log is not None:
+        log.append(
+            f"[P{source_pid}] {label} hero {hero_id}:{engine.card_names.get(hero_id, '?')} -> P{dest_pid}"
+            f"{' (with items)' if items else ''}"
+        )
     return True
 
 
@@ -255,10 +274,11 @@ def _handle_swap_hero(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if ctx.get("protect.steal"):
-        log.append(f"[P{pid}] swap_hero blocked by protection ({step.name})")
+        if log is not None:
+            log.append(f"[P{pid}] swap_hero blocked by protection ({step.name})")
         return
     source_pid = _resolve_party_pid(state, pid, step.source_zone)
     dest_pid = _resolve_party_pid(state, pid, step.dest_zone)
@@ -274,17 +294,18 @@ def _handle_swap_hero(
         ctx.setdefault("_warnings", []).append("swap_hero: activated hero not found")
         return
 
-    source_party = state.players[source_pid].party
+    source = state.players[source_pid]
+    source_party = source.party
     if not source_party:
         return
+    want_active = bool(step.filter_expr) and str(step.filter_expr).strip().lower() == "hero==active"
     amount = step.amount if step.amount is not None else 1
     for _ in range(min(amount, len(source_party))):
         chosen: Optional[int] = None
-        if step.filter_expr and str(step.filter_expr).strip().lower() == "hero==active":
-            if active_hero_id in source_party:
-                chosen = active_hero_id
+        if want_active and active_hero_id in source_party:
+            chosen = active_hero_id
         if chosen is None:
-            chosen = policy.choose_steal_hero(source_party, engine, state.players[source_pid].hero_items)
+            chosen = policy.choose_steal_hero(source_party, engine, source.hero_items)
         if chosen is None:
             return
         if chosen not in source_party:
@@ -304,16 +325,18 @@ def _handle_play_immediately(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     stolen = ctx.get("stolen_card")
     if not isinstance(stolen, dict):
         return
     cid = int(stolen["id"])
-    if cid in state.players[pid].hand:
-        state.players[pid].hand.remove(cid)
+    hand = state.players[pid].hand
+    if cid in hand:
+        hand.remove(cid)
         state.discard_pile.append(cid)
-        log.append(f"[P{pid}] played immediately card_id={cid} (MVP: moved to discard)")
+        if log is not None:
+            log.append(f"[P{pid}] played immediately card_id={cid} (MVP: moved to discard)")
 
 
 def _handle_play_drawn_immediately(
@@ -324,7 +347,7 @@ def _handle_play_drawn_immediately(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     from .actions import play_card_from_hand
 
@@ -357,11 +380,12 @@ def _handle_play_card(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     from .actions import play_card_from_hand
 
-    hand = state.players[pid].hand
+    me = state.players[pid]
+    hand = me.hand
     if not hand:
         return
 
@@ -389,8 +413,9 @@ def _handle_play_card(
             allow_challenge=True,
         )
 
-    state.players[pid].action_points += 1
-    log.append(f"[P{pid}] play_card granted +1 action (now {state.players[pid].action_points})")
+    me.action_points += 1
+    if log is not None:
+        log.append(f"[P{pid}] play_card granted +1 action (now {me.action_points})")
 
 
 def _handle_deny_challenge(
@@ -401,10 +426,11 @@ def _handle_deny_challenge(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     ctx["challenge.denied"] = True
-    log.append(f"[P{pid}] deny_challenge triggered ({step.name})")
+    if log is not None:
+        log.append(f"[P{pid}] deny_challenge triggered ({step.name})")
 
 
 def _handle_trade_hands(
@@ -415,7 +441,7 @@ def _handle_trade_hands(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     target_pid = ctx.get("target_pid")
     if target_pid is None:
@@ -426,15 +452,18 @@ def _handle_trade_hands(
     if target_pid == pid:
         ctx.setdefault("_warnings", []).append("trade_hands: target is self")
         return
-    player_hand = state.players[pid].hand
-    target_hand = state.players[target_pid].hand
-    state.players[pid].hand = list(target_hand)
-    state.players[target_pid].hand = list(player_hand)
-    log.append(
-        f"[P{pid}] trade_hands with P{target_pid} "
-        f"({len(player_hand)} cards -> {len(state.players[pid].hand)}, "
-        f"{len(target_hand)} cards -> {len(state.players[target_pid].hand)})"
-    )
+    me = state.players[pid]
+    target = state.players[target_pid]
+    player_hand = me.hand
+    target_hand = target.hand
+    me.hand = list(target_hand)
+    target.hand = list(player_hand)
+    if log is not None:
+        log.append(
+            f"[P{pid}] trade_hands with P{target_pid} "
+            f"({len(player_hand)} cards -> {len(me.hand)}, "
+            f"{len(target_hand)} cards -> {len(target.hand)})"
+        )
 
 
 def _handle_search_and_draw(
@@ -445,7 +474,7 @@ def _handle_search_and_draw(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if not step.source_zone or not step.dest_zone:
         ctx.setdefault("_warnings", []).append(f"SEARCH_MISSING_ZONES: {step.name}")
@@ -455,21 +484,22 @@ def _handle_search_and_draw(
 
     want_type = None
     if step.filter_expr:
-        m = re.match(r"^type==([a-zA-Z_]\w*)$", str(step.filter_expr).strip())
+        m = _TYPE_FILTER_RE.match(str(step.filter_expr).strip())
         if m:
             want_type = m.group(1).lower()
 
     found_idx = None
+    card_types = engine.card_types
     for i, cid in enumerate(src):
-        typ = str(engine.card_meta.get(cid, {}).get("type", "unknown")).lower()
-        if want_type is None or typ == want_type:
+        if want_type is None or card_types.get(cid, "unknown") == want_type:
             found_idx = i
             break
     if found_idx is None:
         return
     cid = src.pop(found_idx)
     dst.append(cid)
-    log.append(f"[P{pid}] searched {step.source_zone} and took card_id={cid} to {step.dest_zone}")
+    if log is not None:
+        log.append(f"[P{pid}] searched {step.source_zone} and took card_id={cid} to {step.dest_zone}")
 
 
 def _resolve_hero_destruction(
@@ -480,7 +510,7 @@ def _resolve_hero_destruction(
     hero_id: int,
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ) -> bool:
     ctx: Dict[str, Any] = {
         "hero_destroyed": {"id": hero_id, "target": victim_pid, "source": source_pid},
@@ -491,15 +521,14 @@ def _resolve_hero_destruction(
     pre_effects = {"deny", "steal_hero", "protection_from_destroy"}
     for owner in state.players:
         for mid in owner.captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "on_hero_destroyed" not in step.triggers():
-                    continue
-                if (step.effect_kind or "").strip() not in pre_effects:
+            for step in engine.monster_trigger_steps(mid, "on_hero_destroyed"):
+                if step.kind not in pre_effects:
                     continue
                 resolve_effect(step, state, engine, owner.pid, ctx, rng, policy, log)
 
     if ctx.get("denied") or ctx.get("protect.destroy"):
-        log.append(f"[P{victim_pid}] hero {hero_id} destruction prevented")
+        if log is not None:
+            log.append(f"[P{victim_pid}] hero {hero_id} destruction prevented")
         return False
 
     if hero_id not in state.players[victim_pid].party:
@@ -511,10 +540,8 @@ def _resolve_hero_destruction(
 
     for owner in state.players:
         for mid in owner.captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "on_hero_destroyed" not in step.triggers():
-                    continue
-                if (step.effect_kind or "").strip() in pre_effects:
+            for step in engine.monster_trigger_steps(mid, "on_hero_destroyed"):
+                if step.kind in pre_effects:
                     continue
                 resolve_effect(step, state, engine, owner.pid, ctx, rng, policy, log)
 
@@ -529,7 +556,7 @@ def _handle_destroy_hero(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     victim_pid = ctx.get("target_pid")
     if victim_pid is None:
@@ -543,7 +570,8 @@ def _handle_destroy_hero(
         ctx.setdefault("_warnings", []).append("destroy_hero: victim has no heroes")
         return
 
-    log.append(f"[P{pid}] destroy_hero targets P{victim_pid} hero {hid}")
+    if log is not None:
+        log.append(f"[P{pid}] destroy_hero targets P{victim_pid} hero {hid}")
     _resolve_hero_destruction(state, engine, pid, victim_pid, hid, rng, policy, log)
 
 
@@ -555,7 +583,7 @@ def _handle_sacrifice_hero(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     victim_pid = ctx.get("target_pid", pid)
     hid = victim_choose_hero_to_sacrifice(state, engine, victim_pid)
@@ -563,7 +591,8 @@ def _handle_sacrifice_hero(
         ctx.setdefault("_warnings", []).append("sacrifice_hero: no heroes to sacrifice")
         return
 
-    log.append(f"[P{pid}] sacrifice_hero by P{victim_pid} chooses hero {hid}")
+    if log is not None:
+        log.append(f"[P{pid}] sacrifice_hero by P{victim_pid} chooses hero {hid}")
     _resolve_hero_destruction(state, engine, victim_pid, victim_pid, hid, rng, policy, log)
 
 
@@ -575,7 +604,7 @@ def _handle_do_nothing(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     return
 
@@ -588,14 +617,16 @@ def _handle_deny(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     if "challenge.denied" in ctx:
         ctx["challenge.denied"] = True
-        log.append(f"[P{pid}] deny (challenge) via {step.name}")
+        if log is not None:
+            log.append(f"[P{pid}] deny (challenge) via {step.name}")
     else:
         ctx["denied"] = True
-        log.append(f"[P{pid}] deny via {step.name}")
+        if log is not None:
+            log.append(f"[P{pid}] deny via {step.name}")
 
 
 def _handle_protection_from_steal(
@@ -606,7 +637,7 @@ def _handle_protection_from_steal(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     ctx["protect.steal"] = True
 
@@ -619,7 +650,7 @@ def _handle_protection_from_destroy(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     ctx["protect.destroy"] = True
 
@@ -632,7 +663,7 @@ def _handle_protection_from_challenge(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     ctx["protect.challenge"] = True
 
@@ -645,20 +676,27 @@ def _handle_destroy_item(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     victim_pid = ctx.get("target_pid", pid)
+    p = state.players[victim_pid]
+    hero_items = p.hero_items
     hero_id = ctx.get("attached_to_hero") or ctx.get("activated_hero_id")
     if hero_id is None:
-        p = state.players[victim_pid]
-        candidates = [hid for hid in p.party if p.hero_items.get(hid)]
-        if not candidates:
+        best_key: Optional[Tuple[int, int]] = None
+        for hid in p.party:
+            hid_items = hero_items.get(hid)
+            if not hid_items:
+                continue
+            key = (-len(hid_items), hid)
+            if best_key is None or key < best_key:
+                best_key = key
+        if best_key is None:
             ctx.setdefault("_warnings", []).append("destroy_item: no heroes with items")
             return
-        hero_id = sorted(candidates, key=lambda hid: (-len(p.hero_items.get(hid, [])), hid))[0]
+        hero_id = best_key[1]
 
-    p = state.players[victim_pid]
-    items = p.hero_items.get(hero_id, [])
+    items = hero_items.get(hero_id, [])
     if not items:
         ctx.setdefault("_warnings", []).append("destroy_item: hero has no items")
         return
@@ -672,13 +710,16 @@ def _handle_destroy_item(
     state.discard_pile.append(item_id)
     overrides = p.hero_class_overrides.get(hero_id)
     if overrides:
-        p.hero_class_overrides[hero_id] = [entry for entry in overrides if entry[0] != item_id]
-        if not p.hero_class_overrides[hero_id]:
+        filtered = [entry for entry in overrides if entry[0] != item_id]
+        if filtered:
+            p.hero_class_overrides[hero_id] = filtered
+        else:
             p.hero_class_overrides.pop(hero_id, None)
-    log.append(
-        f"[P{pid}] destroy_item -> removed {item_id}:{engine.card_meta.get(item_id,{}).get('name','?')} "
-        f"from P{victim_pid} hero {hero_id}"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] destroy_item -> removed {item_id}:{engine.card_names.get(item_id, '?')} "
+            f"from P{victim_pid} hero {hero_id}"
+        )
 
 
 def _handle_look_at_hand(
@@ -689,7 +730,7 @@ def _handle_look_at_hand(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     target_pid = ctx.get("target_pid")
     if target_pid is None:
@@ -700,9 +741,10 @@ def _handle_look_at_hand(
         target = max(candidates, key=lambda p: (len(p.hand), -p.pid))
         target_pid = target.pid
     hand = state.players[target_pid].hand
-    log.append(
-        f"[P{pid}] look_at_hand sees P{target_pid} hand: {format_card_list(hand, engine.card_meta)}"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] look_at_hand sees P{target_pid} hand: {format_card_list(hand, engine.card_labels)}"
+        )
 
 
 def _handle_reveal_card(
@@ -713,7 +755,7 @@ def _handle_reveal_card(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     source = (step.source_zone or "").strip().lower()
     dest = (step.dest_zone or "").strip().lower()
@@ -723,15 +765,16 @@ def _handle_reveal_card(
         if not drawn:
             ctx.setdefault("_warnings", []).append("reveal_card: missing ctx.drawn_card")
             return
-        card_name = drawn.get("name", "?")
-        card_id = drawn.get("id", "?")
-        if dest == "all_opponents":
-            opp_ids = [p.pid for p in state.players if p.pid != pid]
-            log.append(
-                f"[P{pid}] reveal_card shows drawn {card_id}:{card_name} to opponents {opp_ids}"
-            )
-        else:
-            log.append(f"[P{pid}] reveal_card sees drawn {card_id}:{card_name}")
+        if log is not None:
+            card_name = drawn.get("name", "?")
+            card_id = drawn.get("id", "?")
+            if dest == "all_opponents":
+                opp_ids = [p.pid for p in state.players if p.pid != pid]
+                log.append(
+                    f"[P{pid}] reveal_card shows drawn {card_id}:{card_name} to opponents {opp_ids}"
+                )
+            else:
+                log.append(f"[P{pid}] reveal_card sees drawn {card_id}:{card_name}")
         return
 
     target_pid = ctx.get("target_pid")
@@ -753,9 +796,10 @@ def _handle_reveal_card(
     if revealed is None:
         ctx.setdefault("_warnings", []).append("reveal_card: no card selected")
         return
-    log.append(
-        f"[P{pid}] reveal_card sees P{target_pid} card {revealed}:{engine.card_meta.get(revealed,{}).get('name','?')}"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] reveal_card sees P{target_pid} card {revealed}:{engine.card_names.get(revealed, '?')}"
+        )
 
 
 def _handle_modify_action_total(
@@ -766,46 +810,13 @@ def _handle_modify_action_total(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     delta = step.amount if step.amount is not None else 1
-    state.players[pid].actions_per_turn += delta
-    log.append(f"[P{pid}] modify_action_total {delta:+d} -> {state.players[pid].actions_per_turn}")
-
-
-def _extract_modifier_deltas(step: EffectStep) -> List[int]:
-    def parse_numbers(texts: List[str]) -> List[int]:
-        values: List[int] = []
-        seen = set()
-        for text in texts:
-            if not text:
-                continue
-            for raw in re.findall(r"[-+]?\d+", str(text)):
-                try:
-                    val = int(raw)
-                except ValueError:
-                    continue
-                if val in seen:
-                    continue
-                seen.add(val)
-                values.append(val)
-        return values
-
-    primary: List[str] = []
-    if step.amount is not None:
-        primary.append(str(step.amount))
-    if step.amount_expr:
-        primary.append(step.amount_expr)
-    deltas = parse_numbers(primary)
-    if deltas:
-        return deltas
-
-    fallback: List[str] = []
-    if step.notes:
-        fallback.append(step.notes)
-    if step.filter_expr:
-        fallback.append(step.filter_expr)
-    return parse_numbers(fallback)
+    me = state.players[pid]
+    me.actions_per_turn += delta
+    if log is not None:
+        log.append(f"[P{pid}] modify_action_total {delta:+d} -> {me.actions_per_turn}")
 
 
 def _handle_modify_roll(
@@ -816,9 +827,9 @@ def _handle_modify_roll(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
-    deltas = _extract_modifier_deltas(step)
+    deltas = step.modifier_deltas
     if not deltas:
         ctx.setdefault("_warnings", []).append("modify_roll: missing delta")
         return
@@ -833,18 +844,21 @@ def _handle_modify_roll(
         ctx.setdefault("roll_modifiers", [])
         for delta in deltas:
             ctx["roll_modifiers"].append((step.card_id, delta))
-            log.append(
-                f"[P{pid}] modify_roll adds {delta:+d} "
-                f"({engine.card_meta.get(step.card_id,{}).get('name','?')})"
-            )
+            if log is not None:
+                log.append(
+                    f"[P{pid}] modify_roll adds {delta:+d} "
+                    f"({engine.card_names.get(step.card_id, '?')})"
+                )
         return
 
+    player = state.players[pid]
     for delta in deltas:
-        state.players[pid].roll_modifiers.append((step.card_id, delta, expires_turn))
-        log.append(
-            f"[P{pid}] modify_roll adds {delta:+d} "
-            f"({engine.card_meta.get(step.card_id,{}).get('name','?')})"
-        )
+        player.add_roll_modifier(step.card_id, delta, expires_turn)
+        if log is not None:
+            log.append(
+                f"[P{pid}] modify_roll adds {delta:+d} "
+                f"({engine.card_names.get(step.card_id, '?')})"
+            )
 
 
 def _handle_modify_hero_class(
@@ -855,7 +869,7 @@ def _handle_modify_hero_class(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     hero_id = ctx.get("attached_to_hero") or ctx.get("activated_hero_id")
     if hero_id is None:
@@ -878,19 +892,19 @@ def _handle_modify_hero_class(
     overrides.append((step.card_id, hero_class))
     owner.hero_class_overrides[hero_id] = overrides
 
-    log.append(
-        f"[P{pid}] modify_hero_class -> hero {hero_id}:{engine.card_meta.get(hero_id,{}).get('name','?')} "
-        f"set to {hero_class} ({step.name})"
-    )
+    if log is not None:
+        log.append(
+            f"[P{pid}] modify_hero_class -> hero {hero_id}:{engine.card_names.get(hero_id, '?')} "
+            f"set to {hero_class} ({step.name})"
+        )
 
 
 def _filter_matches_card(engine: Engine, card_id: int, filter_expr: Optional[str]) -> bool:
     if not filter_expr:
         return True
     expr = str(filter_expr).strip().lower()
-    meta = engine.card_meta.get(card_id, {})
-    ctype = str(meta.get("type", "")).lower()
-    subtype = str(meta.get("subtype", "")).lower()
+    ctype = engine.card_types.get(card_id, "")
+    subtype = engine.card_subtypes.get(card_id, "")
     if expr.startswith("type=="):
         want = expr.split("==", 1)[1].strip()
         return ctype == want
@@ -901,15 +915,20 @@ def _filter_matches_card(engine: Engine, card_id: int, filter_expr: Optional[str
 
 
 def _remove_item_overrides(player, item_id: int) -> None:
+    overrides_by_hero = player.hero_class_overrides
+    if not overrides_by_hero:
+        return
     to_clear = []
-    for hero_id, overrides in player.hero_class_overrides.items():
+    for hero_id, overrides in overrides_by_hero.items():
+        if overrides and all(entry[0] != item_id for entry in overrides):
+            continue
         filtered = [entry for entry in overrides if entry[0] != item_id]
         if filtered:
-            player.hero_class_overrides[hero_id] = filtered
+            overrides_by_hero[hero_id] = filtered
         else:
             to_clear.append(hero_id)
     for hero_id in to_clear:
-        player.hero_class_overrides.pop(hero_id, None)
+        overrides_by_hero.pop(hero_id, None)
 
 
 def _collect_return_candidates(
@@ -919,11 +938,12 @@ def _collect_return_candidates(
     filter_expr: Optional[str],
 ) -> List[Dict[str, Any]]:
     p = state.players[target_pid]
+    hero_items = p.hero_items
     candidates: List[Dict[str, Any]] = []
     for hero_id in p.party:
         if _filter_matches_card(engine, hero_id, filter_expr):
             candidates.append({"card_id": hero_id, "kind": "hero", "hero_id": hero_id})
-        for item_id in p.hero_items.get(hero_id, []):
+        for item_id in hero_items.get(hero_id, ()):
             if _filter_matches_card(engine, item_id, filter_expr):
                 candidates.append({"card_id": item_id, "kind": "item", "hero_id": hero_id})
     return candidates
@@ -951,7 +971,7 @@ def _move_return_candidate_to_hand(
     engine: Engine,
     target_pid: int,
     candidate: Dict[str, Any],
-    log: List[str],
+    log: Optional[List[str]],
 ) -> None:
     p = state.players[target_pid]
     card_id = int(candidate["card_id"])
@@ -962,34 +982,65 @@ def _move_return_candidate_to_hand(
             items.remove(card_id)
         _remove_item_overrides(p, card_id)
         p.hand.append(card_id)
-        log.append(
-            f"[P{target_pid}] return_to_hand item {card_id}:{engine.card_meta.get(card_id,{}).get('name','?')} "
-            f"from hero {hero_id}"
-        )
+        if log is not None:
+            log.append(
+                f"[P{target_pid}] return_to_hand item {card_id}:{engine.card_names.get(card_id, '?')} "
+                f"from hero {hero_id}"
+            )
         return
 
     hero_id = int(candidate["hero_id"])
-    if hero_id not in p.party:
+    try:
+        p.party.remove(hero_id)
+    except ValueError:
         return
-    p.party.remove(hero_id)
     p.hand.append(hero_id)
     items = list(p.hero_items.get(hero_id, []))
     if items:
         for item_id in items:
             p.hand.append(item_id)
             _remove_item_overrides(p, item_id)
-        p.hero_items[hero_id] = []
-        log.append(
-            f"[P{target_pid}] return_to_hand hero {hero_id}:{engine.card_meta.get(hero_id,{}).get('name','?')} "
-            f"with items {format_card_list(items, engine.card_meta)}"
-        )
+        del p.hero_items[hero_id]
+        if log is not None:
+            log.append(
+                f"[P{target_pid}] return_to_hand hero {hero_id}:{engine.card_names.get(hero_id, '?')} "
+                f"with items {format_card_list(items, engine.card_labels)}"
+            )
     else:
-        log.append(
-            f"[P{target_pid}] return_to_hand hero {hero_id}:{engine.card_meta.get(hero_id,{}).get('name','?')}"
-        )
+        if log is not None:
+            log.append(
+                f"[P{target_pid}] return_to_hand hero {hero_id}:{engine.card_names.get(hero_id, '?')}"
+            )
     p.hero_class_overrides.pop(hero_id, None)
 
 
+def _return_to_hand_for_pid(
+    state: GameState,
+    engine: Engine,
+    target_pid: int,
+    amount: Optional[int],
+    filter_expr: Optional[str],
+    policy: Policy,
+    log: Optional[List[str]],
+) -> None:
+    candidates = _collect_return_candidates(state, engine, target_pid, filter_expr)
+    if not candidates:
+        return
+    if amount is None:
+        for cand in list(candidates):
+            _move_return_candidate_to_hand(state, engine, target_pid, cand, log)
+        return
+    for _ in range(min(amount, len(candidates))):
+        choice = policy.choose_move_card([c["card_id"] for c in candidates], "player.hand", engine)
+        if choice is None:
+            return
+        selected = next((c for c in candidates if c["card_id"] == choice), None)
+        if selected is None:
+            return
+        candidates.remove(selected)
+        _move_return_candidate_to_hand(state, engine, target_pid, selected, log)
+
+
 def _handle_return_to_hand(
     step: EffectStep,
     state: GameState,
@@ -998,50 +1049,33 @@ def _handle_return_to_hand(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     src = (step.source_zone or "").strip().lower()
     dst = (step.dest_zone or "").strip().lower()
     amount = step.amount
-
-    def resolve_for_pid(target_pid: int) -> None:
-        candidates = _collect_return_candidates(state, engine, target_pid, step.filter_expr)
-        if not candidates:
-            return
-        if amount is None:
-            for cand in list(candidates):
-                _move_return_candidate_to_hand(state, engine, target_pid, cand, log)
-            return
-        for _ in range(min(amount, len(candidates))):
-            choice = policy.choose_move_card([c["card_id"] for c in candidates], "player.hand", engine)
-            if choice is None:
-                return
-            selected = next((c for c in candidates if c["card_id"] == choice), None)
-            if selected is None:
-                return
-            candidates.remove(selected)
-            _move_return_candidate_to_hand(state, engine, target_pid, selected, log)
+    filter_expr = step.filter_expr
 
     if src.startswith("all_players."):
         for target in state.players:
-            resolve_for_pid(target.pid)
+            _return_to_hand_for_pid(state, engine, target.pid, amount, filter_expr, policy, log)
         return
 
     if src.startswith("any_player."):
         target_pid = ctx.get("target_pid")
         if target_pid is None:
-            target_pid = _choose_target_pid_for_return(state, engine, pid, step.filter_expr, prefer_opponents=True)
+            target_pid = _choose_target_pid_for_return(state, engine, pid, filter_expr, prefer_opponents=True)
         if target_pid is None:
             ctx.setdefault("_warnings", []).append("return_to_hand: no valid target for any_player")
             return
-        resolve_for_pid(target_pid)
+        _return_to_hand_for_pid(state, engine, target_pid, amount, filter_expr, policy, log)
         return
 
     if dst.endswith(".hand") and "target_pid" in ctx:
-        resolve_for_pid(int(ctx["target_pid"]))
+        _return_to_hand_for_pid(state, engine, int(ctx["target_pid"]), amount, filter_expr, policy, log)
         return
 
-    resolve_for_pid(pid)
+    _return_to_hand_for_pid(state, engine, pid, amount, filter_expr, policy, log)
 
 
 def _handle_use_hero(
@@ -1052,88 +1086,97 @@ def _handle_use_hero(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     target_pid = _resolve_party_pid(state, pid, step.source_zone) or pid
-    party = state.players[target_pid].party
+    target = state.players[target_pid]
+    party = target.party
     if not party:
         return
-    log.append(
-        "[P{pid}] use_hero start -> target_pid={target_pid} "
-        "source_zone={source_zone} filter={filter_expr} party={party}".format(
-            pid=pid,
-            target_pid=target_pid,
-            source_zone=step.source_zone,
-            filter_expr=step.filter_expr,
-            party=list(party),
+    if log is not None:
+        log.append(
+            "[P{pid}] use_hero start -> target_pid={target_pid} "
+            "source_zone={source_zone} filter={filter_expr} party={party}".format(
+                pid=pid,
+                target_pid=target_pid,
+                source_zone=step.source_zone,
+                filter_expr=step.filter_expr,
+                party=list(party),
+            )
         )
-    )
 
+    active_hero_id = ctx.get("activated_hero_id")
+    stolen = ctx.get("stolen_hero")
     hero_id: Optional[int] = None
     if step.filter_expr:
         filt = str(step.filter_expr).strip().lower()
         if filt == "hero==stolen_now":
-            stolen = ctx.get("stolen_hero")
             if isinstance(stolen, dict):
                 hero_id = stolen.get("id")
             elif isinstance(stolen, int):
                 hero_id = stolen
         elif filt == "hero==active":
-            hero_id = ctx.get("activated_hero_id")
-    log.append(
-        "[P{pid}] use_hero context -> activated_hero_id={active} stolen_hero={stolen}".format(
-            pid=pid,
-            active=ctx.get("activated_hero_id"),
-            stolen=ctx.get("stolen_hero"),
-        )
-    )
-
-    if hero_id is None:
-        hero_id = policy.choose_steal_hero(party, engine, state.players[target_pid].hero_items)
+            hero_id = active_hero_id
+    if log is not None:
         log.append(
-            "[P{pid}] use_hero choose_steal_hero -> hero_id={hero_id}".format(
+            "[P{pid}] use_hero context -> activated_hero_id={active} stolen_hero={stolen}".format(
                 pid=pid,
-                hero_id=hero_id,
+                active=active_hero_id,
+                stolen=stolen,
             )
         )
 
+    if hero_id is None:
+        hero_id = policy.choose_steal_hero(party, engine, target.hero_items)
+        if log is not None:
+            log.append(
+                "[P{pid}] use_hero choose_steal_hero -> hero_id={hero_id}".format(
+                    pid=pid,
+                    hero_id=hero_id,
+                )
+            )
+
     if hero_id is None or hero_id not in party:
         ctx.setdefault("_warnings", []).append("use_hero: missing target hero in party")
         return
 
-    if hero_id in state.players[target_pid].activated_heroes_this_turn:
-        log.append(
-            f"[P{pid}] use_hero skipped -> {hero_id} "
-            f"({engine.card_meta.get(hero_id,{}).get('name','?')}) already activated this turn"
-        )
+    if hero_id in target.activated_heroes_this_turn:
+        if log is not None:
+            log.append(
+                f"[P{pid}] use_hero skipped -> {hero_id} "
+                f"({engine.card_names.get(hero_id, '?')}) already activated this turn"
+            )
         return
 
-    state.players[target_pid].activated_heroes_this_turn.add(hero_id)
-    log.append(
-        f"[P{pid}] use_hero -> {hero_id} "
-        f"({engine.card_meta.get(hero_id,{}).get('name','?')})"
-    )
+    target.activated_heroes_this_turn.add(hero_id)
+    if log is not None:
+        log.append(
+            f"[P{pid}] use_hero -> {hero_id} "
+            f"({engine.card_names.get(hero_id, '?')})"
+        )
 
     local_ctx = dict(ctx)
     local_ctx["activated_hero_id"] = hero_id
     local_ctx["used_hero_id"] = hero_id
-    log.append(
-        "[P{pid}] use_hero resolve_effects -> hero_id={hero_id} steps={count}".format(
-            pid=pid,
-            hero_id=hero_id,
-            count=len(engine.effects_by_card.get(hero_id, [])),
+    if log is not None:
+        log.append(
+            "[P{pid}] use_hero resolve_effects -> hero_id={hero_id} steps={count}".format(
+                pid=pid,
+                hero_id=hero_id,
+                count=len(engine.effects_by_card.get(hero_id, [])),
+            )
         )
-    )
     for hero_step in engine.effects_by_card.get(hero_id, []):
         trig = hero_step.triggers()
         if "on_activation" in trig or "auto" in trig:
             resolve_effect(hero_step, state, engine, pid, local_ctx, rng, policy, log)
-    log.append(
-        "[P{pid}] use_hero resolved_effects -> hero_id={hero_id}".format(
-            pid=pid,
-            hero_id=hero_id,
+    if log is not None:
+        log.append(
+            "[P{pid}] use_hero resolved_effects -> hero_id={hero_id}".format(
+                pid=pid,
+                hero_id=hero_id,
+            )
         )
-    )
 
     for w in local_ctx.get("_warnings", []):
         ctx.setdefault("_warnings", []).append(w)
@@ -1182,7 +1225,7 @@ def resolve_effect(
     ctx: Dict[str, Any],
     rng: "random.Random",
     policy: Policy,
-    log: List[str],
+    log: Optional[List[str]],
 ):
     ctx.setdefault("player", pid)
     if step.step == 2 and not ctx.get("roll.success", False):
@@ -1198,7 +1241,7 @@ def resolve_effect(
         elif target_pid == pid:
             opponent_classes = set()
         else:
-            opponent_classes = collect_party_classes(engine, state.players[target_pid])
+            opponent_classes = set(collect_party_classes(engine, state.players[target_pid]))
         ctx["opponent"] = {"party": opponent_classes}
 
     if not eval_condition(step.condition, ctx):
@@ -1212,10 +1255,10 @@ def resolve_effect(
             ctx["target_pid"] = pid
 
     if step.requires_roll:
-        for mid in state.players[pid].captured_monsters:
-            for mstep in engine.monster_effects.get(mid, []):
-                if "on_hero_roll" in mstep.triggers():
-                    resolve_effect(mstep, state, engine, pid, ctx, rng, policy, log)
+        captured_monsters = state.players[pid].captured_monsters
+        for mid in captured_monsters:
+            for mstep in engine.monster_trigger_steps(mid, "on_hero_roll"):
+                resolve_effect(mstep, state, engine, pid, ctx, rng, policy, log)
 
         op, target = parse_simple_condition(step.roll_condition)
         final = resolve_roll_event(
@@ -1231,19 +1274,19 @@ def resolve_effect(
             policy=policy,
         )
         ok = goal_satisfied(final, op, target)
-        log.append(
-            f"[P{pid}] roll 2d6={final} vs {step.roll_condition} -> {'PASS' if ok else 'FAIL'} ({step.name})"
-        )
+        if log is not None:
+            log.append(
+                f"[P{pid}] roll 2d6={final} vs {step.roll_condition} -> {'PASS' if ok else 'FAIL'} ({step.name})"
+            )
         if not ok:
             return
 
         ctx.update({"roll.total": final, "roll.success": ok, "roll_player": pid})
-        for mid in state.players[pid].captured_monsters:
-            for mstep in engine.monster_effects.get(mid, []):
-                if "on_hero_roll_success" in mstep.triggers():
-                    resolve_effect(mstep, state, engine, pid, ctx, rng, policy, log)
+        for mid in captured_monsters:
+            for mstep in engine.monster_trigger_steps(mid, "on_hero_roll_success"):
+                resolve_effect(mstep, state, engine, pid, ctx, rng, policy, log)
 
-    ek = (step.effect_kind or "").strip()
+    ek = step.kind
     handler = EFFECT_HANDLERS.get(ek)
     if handler is None:
         ctx.setdefault("_warnings", []).append(f"UNIMPLEMENTED_EFFECT_KIND: {ek} ({step.name})")
@@ -5,44 +5,53 @@ from .actions import choose_and_take_action
 from .effects import resolve_effect
 from .loaders import build_engine
 from .models import GameState, PlayerState, Policy
-from .game_helpers import collect_party_classes
-from .setup import build_decks, log_turn_state, setup_game
+from .game_helpers import (
+    check_party_has_classes,
+    collect_party_classes,
+    passive_monster_steps,
+)
+from .setup import log_turn_state, setup_game, shuffled_decks
 
 
-def _required_hero_classes(engine) -> set:
-    return {
-        str(meta.get("subtype", "")).strip().lower()
-        for meta in engine.card_meta.values()
-        if str(meta.get("type", "")).strip().lower() in ("hero", "party_leader", "party leader", "leader", "party-leader")
-        and str(meta.get("subtype", "")).strip()
-    }
-
-
-def _check_win_conditions(state: GameState, engine, log: List[str]) -> Optional[int]:
-    required_classes = _required_hero_classes(engine)
+def check_win_conditions(state: GameState, engine, log: Optional[List[str]]) -> Optional[int]:
+    required_classes = engine.required_hero_classes
+    n_required = len(required_classes)
     for player in state.players:
         if len(player.captured_monsters) >= 3:
-            log.append(f"[WIN] P{player.pid} captured {len(player.captured_monsters)} monsters")
+            if log is not None:
+                log.append(f"[WIN] P{player.pid} captured {len(player.captured_monsters)} monsters")
             return player.pid
-        party_classes = collect_party_classes(engine, player)
-        if required_classes and required_classes.issubset(party_classes):
-            log.append(
-                f"[WIN] P{player.pid} assembled party classes: {', '.join(sorted(party_classes))}"
-            )
+        if not n_required or len(player.party) + (player.party_leader is not None) < n_required:
+            continue
+        if check_party_has_classes(engine, player, required_classes):
+            if log is not None:
+                party_classes = collect_party_classes(engine, player)
+                log.append(
+                    f"[WIN] P{player.pid} assembled party classes: {', '.join(sorted(party_classes))}"
+                )
             return player.pid
     return None
 
 
-def run_game(seed: int = 1, turns: int = 10, n_players: int = 4, policy: Optional[Policy] = None) -> List[str]:
+def run_game(
+    seed: int = 1,
+    turns: int = 10,
+    n_players: int = 4,
+    policy: Optional[Policy] = None,
+    record_log: bool = True,
+) -> List[str]:
+    """
+    Play one game and return its log lines.
+
+    With record_log=False no log lines are built at all (the engine receives
+    log=None) and an empty list is returned; game outcomes are unchanged.
+    """
     rng = random.Random(seed)
     engine = build_engine()
     policy = policy or Policy()
     policy.expand_feature_weights_for_engine(engine)
 
-    draw_deck, monster_deck, leader_deck = build_decks(engine.card_meta)
-    rng.shuffle(draw_deck)
-    rng.shuffle(monster_deck)
-    rng.shuffle(leader_deck)
+    draw_deck, monster_deck, leader_deck = shuffled_decks(engine, rng)
 
     players = [PlayerState(pid=i) for i in range(n_players)]
     state = GameState(
@@ -52,28 +61,21 @@ def run_game(seed: int = 1, turns: int = 10, n_players: int = 4, policy: Optiona
         party_leader_deck=leader_deck,
     )
 
-    log: List[str] = []
+    log: Optional[List[str]] = [] if record_log else None
     setup_game(state, engine, rng, log)
 
     winner_pid: Optional[int] = None
     for t in range(turns):
         state.turn = t + 1
         for player in state.players:
-            if player.roll_modifiers:
-                player.roll_modifiers = [
-                    entry
-                    for entry in player.roll_modifiers
-                    if entry[2] is None or entry[2] >= state.turn
-                ]
+            player.expire_roll_modifiers(state.turn)
         pid = t % len(state.players)
         state.active_pid = pid
         p = state.players[pid]
         p.activated_heroes_this_turn.clear()
         p.actions_per_turn = 3
-        for mid in p.captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "passive" in step.triggers():
-                    resolve_effect(step, state, engine, pid, {}, rng, policy, log)
+        for step in passive_monster_steps(engine, p):
+            resolve_effect(step, state, engine, pid, {}, rng, policy, log)
         p.action_points = p.actions_per_turn
 
         log_turn_state(state, engine, pid, log)
@@ -83,11 +85,11 @@ def run_game(seed: int = 1, turns: int = 10, n_players: int = 4, policy: Optiona
             acted = choose_and_take_action(state, engine, pid, rng, policy, log)
             if not acted:
                 break
-            winner_pid = _check_win_conditions(state, engine, log)
+            winner_pid = check_win_conditions(state, engine, log)
             if winner_pid is not None:
                 break
             safety -= 1
         if winner_pid is not None:
             break
 
-    return log
+    return log if log is not None else []
@@ -1,16 +1,30 @@
 import re
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
-from .models import Engine, GameState, PlayerState
+from .models import EffectStep, Engine, GameState, PlayerState
 from .utils import format_card_list
 
+_REQUIREMENT_KV_RE = re.compile(r"([a-zA-Z][a-zA-Z\s-]*)\s*:\s*(\d+)")
+_REQUIREMENT_COUNT_CLASS_RE = re.compile(r"(\d+)\s*\(([^)]+)\)")
+
+
+def passive_monster_steps(engine: Engine, player: PlayerState) -> List[EffectStep]:
+    """Passive steps of the player's captured monsters, cached per captured set."""
+    signature = tuple(player.captured_monsters)
+    cached = player.passive_steps_cache
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    steps = [step for mid in signature for step in engine.monster_passive_effects.get(mid, ())]
+    player.passive_steps_cache = (signature, steps)
+    return steps
+
 
 def get_zone(state: GameState, pid: int, zone: str) -> List[int]:
     z = zone.strip().lower()
     if z.startswith("opponent.") or z.startswith("opponents."):
         opponent_pid = pick_opponent_pid(state, pid)
-        if opponent_pid is None and len(state.players) > 1:
-            opponent_pid = (pid + 1) % len(state.players)
+        if opponent_pid is None and state.n_players > 1:
+            opponent_pid = state.opponent_of[pid]
         if opponent_pid is None:
             return []
         p = state.players[opponent_pid]
@@ -43,21 +57,33 @@ def get_hero_class(engine: Engine, player: "PlayerState", hero_id: int) -> Optio
     overrides = player.hero_class_overrides.get(hero_id)
     if overrides:
         return overrides[-1][1].strip().lower() or None
-    subtype = str(engine.card_meta.get(hero_id, {}).get("subtype", "")).strip().lower()
+    subtype = engine.card_subtypes.get(hero_id, "")
     return subtype or None
 
 
-def collect_party_classes(engine: Engine, player: "PlayerState") -> Set[str]:
+def collect_party_classes(engine: Engine, player: "PlayerState") -> FrozenSet[str]:
     classes: Set[str] = set()
     for hero_id in player.party:
         hero_class = get_hero_class(engine, player, hero_id)
         if hero_class:
             classes.add(hero_class)
     if player.party_leader is not None:
-        leader_class = str(engine.card_meta.get(player.party_leader, {}).get("subtype", "")).strip().lower()
+        leader_class = engine.card_subtypes.get(player.party_leader, "")
         if leader_class:
             classes.add(leader_class)
-    return classes
+    return frozenset(classes)
+
+
+def check_party_has_classes(engine: Engine, player: "PlayerState", required: FrozenSet[str]) -> bool:
+    """True if the party (heroes plus leader) covers every class in required."""
+    remaining = set(required)
+    if player.party_leader is not None:
+        remaining.discard(engine.card_subtypes.get(player.party_leader, ""))
+    for hero_id in player.party:
+        if not remaining:
+            return True
+        remaining.discard(get_hero_class(engine, player, hero_id))
+    return not remaining
 
 
 def parse_attack_requirements(attack_requirements: Optional[Union[str, Dict[str, int]]]) -> Dict[str, int]:
@@ -71,7 +97,7 @@ def parse_attack_requirements(attack_requirements: Optional[Union[str, Dict[str,
         return {}
 
     requirements: Dict[str, int] = {}
-    key_value_pairs = re.findall(r"([a-zA-Z][a-zA-Z\\s-]*)\\s*:\\s*(\\d+)", normalized)
+    key_value_pairs = _REQUIREMENT_KV_RE.findall(normalized)
     if key_value_pairs:
         for raw_key, raw_count in key_value_pairs:
             key = raw_key.strip().lower()
@@ -80,7 +106,7 @@ def parse_attack_requirements(attack_requirements: Optional[Union[str, Dict[str,
             requirements[key] = requirements.get(key, 0) + int(raw_count)
         return requirements
 
-    pairs = re.findall(r"(\\d+)\\s*\\(([^)]+)\\)", normalized)
+    pairs = _REQUIREMENT_COUNT_CLASS_RE.findall(normalized)
     for count, cls in pairs:
         key = cls.strip().lower()
         if not key:
@@ -96,21 +122,26 @@ def collect_party_class_counts(engine: Engine, player: PlayerState) -> Dict[str,
         if hero_class:
             counts[hero_class] = counts.get(hero_class, 0) + 1
     if player.party_leader is not None:
-        leader_class = str(engine.card_meta.get(player.party_leader, {}).get("subtype", "")).strip().lower()
+        leader_class = engine.card_subtypes.get(player.party_leader, "")
         if leader_class:
             counts[leader_class] = counts.get(leader_class, 0) + 1
     return counts
 
 
-def can_player_attack_monster(player: PlayerState, engine: Engine, monster_id: int) -> bool:
+def can_player_attack_monster(
+    player: PlayerState,
+    engine: Engine,
+    monster_id: int,
+    class_counts: Optional[Dict[str, int]] = None,
+) -> bool:
+    """class_counts, when given, must be collect_party_class_counts(engine, player) for the current party."""
     rule = engine.monster_attack_rules.get(monster_id)
     if not rule or not rule.attack_requirements:
         return True
-    requirements = parse_attack_requirements(rule.attack_requirements)
-    if not requirements:
-        return True
+    requirements = rule.attack_requirements
     total_heroes = len(player.party) + (1 if player.party_leader is not None else 0)
-    class_counts = collect_party_class_counts(engine, player)
+    if class_counts is None:
+        class_counts = collect_party_class_counts(engine, player)
     for req_class, count in requirements.items():
         if req_class == "any":
             if total_heroes < count:
@@ -120,33 +151,35 @@ def can_player_attack_monster(player: PlayerState, engine: Engine, monster_id: i
     return True
 
 
-def destroy_hero_card(state: GameState, engine: Engine, victim_pid: int, hero_id: int, log: List[str]) -> bool:
+def destroy_hero_card(state: GameState, engine: Engine, victim_pid: int, hero_id: int, log: Optional[List[str]]) -> bool:
     p = state.players[victim_pid]
-    if hero_id not in p.party:
+    try:
+        p.party.remove(hero_id)
+    except ValueError:
         return False
 
-    items = list(p.hero_items.get(hero_id, []))
+    items = p.hero_items.get(hero_id)
     if items:
-        for item_id in items:
-            state.discard_pile.append(item_id)
-        p.hero_items[hero_id] = []
-        log.append(
-            f"[P{victim_pid}] hero {hero_id} dies -> discarded items: {format_card_list(items, engine.card_meta)}"
-        )
+        del p.hero_items[hero_id]
+        state.discard_pile.extend(items)
+        if log is not None:
+            log.append(
+                f"[P{victim_pid}] hero {hero_id} dies -> discarded items: {format_card_list(items, engine.card_labels)}"
+            )
     p.hero_class_overrides.pop(hero_id, None)
 
-    p.party.remove(hero_id)
     state.discard_pile.append(hero_id)
-    log.append(
-        f"[P{victim_pid}] hero destroyed/sacrificed -> {hero_id}:{engine.card_meta.get(hero_id,{}).get('name','?')}"
-    )
+    if log is not None:
+        log.append(f"[P{victim_pid}] hero destroyed/sacrificed -> {hero_id}:{engine.card_names.get(hero_id, '?')}")
     return True
 
 
 def pick_opponent_pid(state: GameState, pid: int) -> Optional[int]:
-    n = len(state.players)
-    for off in range(1, n):
-        op = (pid + off) % n
+    n = state.n_players
+    if n == 2:
+        op = state.opponent_of[pid]
+        return op if state.players[op].party else None
+    for op in state.opponents_ring[pid]:
         if state.players[op].party:
             return op
     return None
@@ -154,27 +187,11 @@ def pick_opponent_pid(state: GameState, pid: int) -> Optional[int]:
 
 def attacker_choose_hero_to_destroy(state: GameState, engine: Engine, victim_pid: int) -> Optional[int]:
     p = state.players[victim_pid]
-    if not p.party:
-        return None
-    best = None
-    best_score = -1
-    for hid in p.party:
-        score = len(p.hero_items.get(hid, []))
-        if score > best_score:
-            best_score = score
-            best = hid
-    return best
+    hero_items = p.hero_items
+    return max(p.party, key=lambda hid: len(hero_items.get(hid, ())), default=None)
 
 
 def victim_choose_hero_to_sacrifice(state: GameState, engine: Engine, victim_pid: int) -> Optional[int]:
     p = state.players[victim_pid]
-    if not p.party:
-        return None
-    best = None
-    best_score = 10**9
-    for hid in p.party:
-        score = len(p.hero_items.get(hid, []))
-        if score < best_score:
-            best_score = score
-            best = hid
-    return best
+    hero_items = p.hero_items
+    return min(p.party, key=lambda hid: len(hero_items.get(hid, ())), default=None)
@@ -1,91 +1,140 @@
+import csv
+import functools
+import itertools
 import json
-import re
-from typing import Any, Dict, List, Tuple
-
-import pandas as pd
-
 import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 
 from .constants import CARDS_CSV, EFFECTS_JSON, MONSTERS_CSV, MONSTERS_JSON, TUNING_JSON
 from .game_helpers import parse_attack_requirements
 from .models import EffectStep, Engine, MonsterRule
 from .tuning import compute_card_tuning_value
+from .utils import EFFECT_INT_RE, normalize_card_text
+
+
+def _text(value: Any) -> str:
+    # JSON rows already carry strings; only coerce the odd numeric value.
+    return value if isinstance(value, str) else str(value)
+
+
+def _opt_str(r: Dict[str, Any], key: str, strip: bool = False) -> Optional[str]:
+    """Value of a nullable field, or None when it is missing, blank or "nan"."""
+    value = r.get(key)
+    if not value:
+        return None
+    text = _text(value)
+    stripped = text.strip()
+    if not stripped or stripped == "nan":
+        return None
+    return stripped if strip else text
+
+
+def _opt_intern(r: Dict[str, Any], key: str) -> Optional[str]:
+    value = _opt_str(r, key)
+    return sys.intern(value) if value is not None else None
+
+
+def _effect_step_from_row(r: Dict[str, Any], card_id: int, default_name: str) -> EffectStep:
+    raw_amt = _opt_str(r, "amount", strip=True)
+    amount = None
+    amount_expr = None
+    if raw_amt is not None and raw_amt.lower() != "nan":
+        try:
+            amount = int(float(raw_amt))
+        except ValueError:
+            amount_expr = raw_amt
+
+    return EffectStep(
+        name=_text(r.get("name", default_name)),
+        card_id=card_id,
+        step=int(r.get("step", 1)),
+        trigger=sys.intern(_text(r.get("trigger") or "")),
+        effect_kind=sys.intern(_text(r.get("effect_kind") or "")),
+        source_zone=_opt_intern(r, "source_zone"),
+        dest_zone=_opt_intern(r, "dest_zone"),
+        filter_expr=_opt_str(r, "filter"),
+        amount=amount,
+        amount_expr=amount_expr,
+        requires_roll=(_opt_str(r, "requires_roll", strip=True) or "").lower() in ("true", "1", "yes"),
+        roll_condition=_opt_str(r, "roll_condition"),
+        condition=_opt_str(r, "condition"),
+        notes=_opt_str(r, "notes"),
+        duration=_opt_str(r, "duration"),
+    )
+
+
+def _group_steps_by_card(steps: List[EffectStep]) -> Dict[int, List[EffectStep]]:
+    # One stable sort by (card_id, step) leaves each card's steps contiguous and in order.
+    steps.sort(key=lambda s: (s.card_id, s.step))
+    return {cid: list(group) for cid, group in itertools.groupby(steps, key=lambda s: s.card_id)}
 
 
 def load_effects() -> Dict[int, List[EffectStep]]:
-    steps_by_card: Dict[int, List[EffectStep]] = {}
     with open(EFFECTS_JSON, encoding="utf-8") as f:
         rows = json.load(f)
 
-    for r in rows:
-        raw_amt = str(r.get("amount") or "").strip() or None
-        amount = None
-        amount_expr = None
-        if raw_amt and raw_amt.lower() != "nan":
-            try:
-                amount = int(float(raw_amt))
-            except ValueError:
-                amount_expr = raw_amt
-
-        step = EffectStep(
-            name=str(r.get("name", "")),
-            card_id=int(r["card_id"]),
-            step=int(r.get("step", 1)),
-            trigger=str(r.get("trigger", "") or ""),
-            effect_kind=str(r.get("effect_kind", "") or ""),
-            source_zone=None if str(r.get("source_zone") or "").strip() in ("", "nan") else str(r.get("source_zone")),
-            dest_zone=None if str(r.get("dest_zone") or "").strip() in ("", "nan") else str(r.get("dest_zone")),
-            filter_expr=None if str(r.get("filter") or "").strip() in ("", "nan") else str(r.get("filter")),
-            amount=amount,
-            amount_expr=amount_expr,
-            requires_roll=str(r.get("requires_roll") or "").strip().lower() in ("true", "1", "yes"),
-            roll_condition=None if str(r.get("roll_condition") or "").strip() in ("", "nan") else str(r.get("roll_condition")),
-            condition=None if str(r.get("condition") or "").strip() in ("", "nan") else str(r.get("condition")),
-            notes=None if str(r.get("notes") or "").strip() in ("", "nan") else str(r.get("notes")),
-            duration=None if str(r.get("duration") or "").strip() in ("", "nan") else str(r.get("duration")),
-        )
-        steps_by_card.setdefault(step.card_id, []).append(step)
+    return _group_steps_by_card([_effect_step_from_row(r, int(r["card_id"]), "") for r in rows])
 
-    for cid in steps_by_card:
-        steps_by_card[cid].sort(key=lambda s: s.step)
 
-    return steps_by_card
+_CARD_COLUMNS = ("id", "name", "card_type", "subtype", "action_cost", "copies_in_deck")
 
 
-def load_card_meta() -> Dict[int, Dict[str, Any]]:
-    df = pd.read_csv(CARDS_CSV)
-    df = df.loc[:, ~df.columns.str.contains(r"^Unnamed")]
+def _read_csv_rows(path: str, usecols: Optional[Tuple[str, ...]] = None) -> List[Dict[str, str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        columns = [(i, key) for i, key in enumerate(header) if key and (usecols is None or key in usecols)]
+        width = len(header)
+        rows: List[Dict[str, str]] = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            rows.append({key: row[i] for i, key in columns})
+        return rows
+
+
+def _csv_int(raw: Optional[str], default: int) -> int:
+    raw = (raw or "").strip()
+    if not raw or raw.lower() == "nan":
+        return default
+    return int(float(raw))
 
+
+def load_card_meta() -> Dict[int, Dict[str, Any]]:
     meta: Dict[int, Dict[str, Any]] = {}
-    for _, r in df.iterrows():
-        cid = int(r["id"])
-        ctype = str(r.get("card_type", "unknown")).strip().lower()
+    for r in _read_csv_rows(CARDS_CSV, usecols=_CARD_COLUMNS):
+        if not r.get("id", "").strip():
+            continue
+        cid = _csv_int(r["id"], 0)
+        ctype = sys.intern((r.get("card_type") or "unknown").strip().lower())
         meta[cid] = {
             "id": cid,
-            "name": str(r.get("name", f"card_{cid}")),
+            "name": sys.intern(r.get("name") or f"card_{cid}"),
             "type": ctype,
-            "subtype": str(r.get("subtype", "") if not pd.isna(r.get("subtype")) else ""),
-            "action_cost": int(r.get("action_cost", 1) if not pd.isna(r.get("action_cost")) else 1),
-            "copies_in_deck": int(r.get("copies_in_deck", 1) if not pd.isna(r.get("copies_in_deck")) else 1),
+            "subtype": sys.intern(r.get("subtype", "")),
+            "action_cost": _csv_int(r.get("action_cost"), 1),
+            "copies_in_deck": _csv_int(r.get("copies_in_deck"), 1),
         }
     return meta
 
 
 def load_monsters(monsters_json: str = MONSTERS_JSON) -> Tuple[Dict[int, MonsterRule], Dict[int, List[EffectStep]]]:
     attack_rule: Dict[int, MonsterRule] = {}
-    effects: Dict[int, List[EffectStep]] = {}
 
     with open(monsters_json, encoding="utf-8") as f:
         payload = json.load(f)
 
-    df = pd.read_csv(MONSTERS_CSV)
-    df = df.loc[:, ~df.columns.str.contains(r"^Unnamed")]
     attack_requirements: Dict[int, str] = {}
-    for _, r in df.iterrows():
-        raw = str(r.get("attack_requirements") or "").strip()
+    for r in _read_csv_rows(MONSTERS_CSV, usecols=("card_id", "attack_requirements")):
+        raw = r.get("attack_requirements", "").strip()
         if not raw or raw.lower() == "nan":
             continue
-        mid = int(r["card_id"])
+        mid = _csv_int(r.get("card_id"), 0)
         attack_requirements.setdefault(mid, raw)
 
     for r in payload.get("attack_rules", []):
@@ -98,81 +147,54 @@ def load_monsters(monsters_json: str = MONSTERS_JSON) -> Tuple[Dict[int, Monster
         parsed_requirements = parse_attack_requirements(raw_attack_requirements or attack_requirements.get(mid))
         attack_rule[mid] = MonsterRule(
             monster_id=mid,
-            success_condition=None if str(r.get("success_condition") or "").strip() in ("", "nan") else str(r.get("success_condition")).strip(),
-            fail_condition=None if str(r.get("fail_condition") or "").strip() in ("", "nan") else str(r.get("fail_condition")).strip(),
-            success_action=None if str(r.get("success_action") or "").strip() in ("", "nan") else str(r.get("success_action")).strip(),
-            fail_action=None if str(r.get("fail_action") or "").strip() in ("", "nan") else str(r.get("fail_action")).strip(),
+            success_condition=_opt_str(r, "success_condition", strip=True),
+            fail_condition=_opt_str(r, "fail_condition", strip=True),
+            success_action=_opt_str(r, "success_action", strip=True),
+            fail_action=_opt_str(r, "fail_action", strip=True),
             attack_requirements=parsed_requirements or None,
         )
 
+    monster_steps = []
     for r in payload.get("effects", []):
         mid = int(r["card_id"])
-        raw_amt = str(r.get("amount") or "").strip() or None
-        amount = None
-        amount_expr = None
-        if raw_amt and raw_amt.lower() != "nan":
-            try:
-                amount = int(float(raw_amt))
-            except ValueError:
-                amount_expr = raw_amt
-
-        step = EffectStep(
-            name=str(r.get("name", f"monster_{mid}")),
-            card_id=mid,
-            step=int(r.get("step", 1)),
-            trigger=str(r.get("trigger", "") or ""),
-            effect_kind=str(r.get("effect_kind", "") or ""),
-            source_zone=None if str(r.get("source_zone") or "").strip() in ("", "nan") else str(r.get("source_zone")),
-            dest_zone=None if str(r.get("dest_zone") or "").strip() in ("", "nan") else str(r.get("dest_zone")),
-            filter_expr=None if str(r.get("filter") or "").strip() in ("", "nan") else str(r.get("filter")),
-            amount=amount,
-            amount_expr=amount_expr,
-            requires_roll=str(r.get("requires_roll") or "").strip().lower() in ("true", "1", "yes"),
-            roll_condition=None if str(r.get("roll_condition") or "").strip() in ("", "nan") else str(r.get("roll_condition")),
-            condition=None if str(r.get("condition") or "").strip() in ("", "nan") else str(r.get("condition")),
-            notes=None if str(r.get("notes") or "").strip() in ("", "nan") else str(r.get("notes")),
-            duration=None if str(r.get("duration") or "").strip() in ("", "nan") else str(r.get("duration")),
-        )
-        effects.setdefault(mid, []).append(step)
+        monster_steps.append(_effect_step_from_row(r, mid, f"monster_{mid}"))
+
+    return attack_rule, _group_steps_by_card(monster_steps)
 
-    for mid in effects:
-        effects[mid].sort(key=lambda s: s.step)
 
-    return attack_rule, effects
+def _extract_ints(text: str) -> List[int]:
+    # Most amount fields are a bare signed integer ("+2", "-1"); int() handles
+    # those directly and the regex is only needed for free-form text.
+    if "_" not in text:
+        try:
+            return [int(text)]
+        except ValueError:
+            pass
+    return [int(s) for s in EFFECT_INT_RE.findall(text)]
 
 
-def build_modifier_options(card_meta: Dict[int, Dict[str, Any]], effects_by_card: Dict[int, List[EffectStep]]) -> Dict[int, List[int]]:
+def build_modifier_options(
+    card_meta: Dict[int, Dict[str, Any]], effects_by_card: Dict[int, List[EffectStep]]
+) -> Dict[int, Tuple[int, ...]]:
     """
-    Returns: {modifier_card_id: [delta1, delta2, ...]}
+    Returns: {modifier_card_id: (delta1, delta2, ...)}
     Extracts integer deltas from effect rows (amount_expr/amount/notes/filter_expr).
     """
-    out: Dict[int, List[int]] = {}
+    out: Dict[int, Tuple[int, ...]] = {}
     for cid, m in card_meta.items():
-        if str(m.get("type", "")).lower() != "modifier":
+        if normalize_card_text(m.get("type", "")) != "modifier":
             continue
 
         opts = set()
+        texts: List[str] = []
         for step in effects_by_card.get(cid, []):
-            candidates: List[str] = []
-            if getattr(step, "amount_expr", None):
-                candidates.append(step.amount_expr)
-            if getattr(step, "amount", None) is not None:
-                candidates.append(str(step.amount))
-            if step.notes:
-                candidates.append(step.notes)
-            if step.filter_expr:
-                candidates.append(step.filter_expr)
-
-            for text in candidates:
-                if not text:
-                    continue
-                for s in re.findall(r"[-+]?\d+", str(text)):
-                    try:
-                        opts.add(int(s))
-                    except ValueError:
-                        pass
-
-        out[cid] = sorted(opts, reverse=True) if opts else []
+            if step.amount is not None:
+                opts.add(step.amount)
+            texts.extend(text for text in (step.amount_expr, step.notes, step.filter_expr) if text)
+        if texts:
+            opts.update(_extract_ints("\n".join(texts)))
+
+        out[cid] = tuple(sorted(opts, reverse=True))
     return out
 
 
@@ -209,7 +231,13 @@ def apply_tuning_values(
         )
 
 
+@functools.lru_cache(maxsize=1)
 def build_engine() -> Engine:
+    """
+    Builds the shared, read-only Engine. The result is cached so repeated
+    run_game/train/evaluate calls reuse one engine; call
+    build_engine.cache_clear() to force a reload of the card data.
+    """
     effects_by_card = load_effects()
     card_meta = load_card_meta()
     monster_attack_rules, monster_effects = load_monsters(MONSTERS_JSON)
@@ -1,17 +1,97 @@
 from __future__ import annotations
 
+import functools
 import json
 import math
 import os
 import random
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 from collections import defaultdict
 
-from .utils import find_challenge_card_in_hand
-
-
-@dataclass
+from .conditions import parse_roll_condition
+from .utils import EFFECT_INT_RE, find_challenge_card_in_hand, normalize_card_text
+
+
+_PLAY_TRIGGERS = frozenset({"on_play", "auto", "on_activation"})
+_NO_MONSTER_STEPS: Dict[int, Tuple[Any, ...]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _card_feature_keys(card_id: int) -> Tuple[str, str]:
+    # Reusing the same key strings lets weight lookups skip re-hashing a fresh f-string.
+    return sys.intern(f"card:{card_id}"), sys.intern(f"monster:{card_id}")
+
+
+_CARD_TYPE_BASE_VALUES = {
+    "hero": 60,
+    "item": 45,
+    "magic": 35,
+    "challenge": 25,
+    "modifier": 15,
+    "monster": 5,
+    "party_leader": 80,
+}
+
+
+def _card_value_parts(
+    card_id: int, ctype: str, tuning_value: Optional[float], action_cost: Any
+) -> Tuple[Optional[float], int, str, Optional[str]]:
+    # The weight-independent part of Policy.score_card_value:
+    # (finite tuning value or None, base + cost fallback, card key, monster key).
+    tuned_value = None
+    if tuning_value is not None and math.isfinite(tuning_value):
+        tuned_value = float(tuning_value)
+    cost = int(action_cost or 1)
+    card_key, monster_key = _card_feature_keys(card_id)
+    return (
+        tuned_value,
+        _CARD_TYPE_BASE_VALUES.get(ctype, 20) + cost,
+        card_key,
+        monster_key if ctype == "monster" else None,
+    )
+
+
+def _parse_modifier_deltas(step: EffectStep) -> Tuple[int, ...]:
+    if step.amount is not None and not step.amount_expr and not step.notes and not step.filter_expr:
+        return (step.amount,)
+
+    def parse_numbers(texts: List[str]) -> List[int]:
+        values: List[int] = []
+        seen = set()
+        for text in texts:
+            if not text:
+                continue
+            for raw in EFFECT_INT_RE.findall(str(text)):
+                try:
+                    val = int(raw)
+                except ValueError:
+                    continue
+                if val in seen:
+                    continue
+                seen.add(val)
+                values.append(val)
+        return values
+
+    primary: List[str] = []
+    if step.amount is not None:
+        primary.append(str(step.amount))
+    if step.amount_expr:
+        primary.append(step.amount_expr)
+    deltas = parse_numbers(primary)
+    if deltas:
+        return tuple(deltas)
+
+    fallback: List[str] = []
+    if step.notes:
+        fallback.append(step.notes)
+    if step.filter_expr:
+        fallback.append(step.filter_expr)
+    return tuple(parse_numbers(fallback))
+
+
+@dataclass(frozen=True, slots=True)
 class EffectStep:
     name: str
     card_id: int
@@ -28,27 +108,66 @@ class EffectStep:
     condition: Optional[str]
     notes: Optional[str]
     duration: Optional[str]
+    trigger_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # effect_kind with surrounding whitespace removed; what handler dispatch keys on.
+    kind: str = field(init=False, repr=False, compare=False)
+    # Candidate roll deltas for modify_roll steps, parsed from amount/amount_expr/notes/filter_expr.
+    modifier_deltas: Tuple[int, ...] = field(init=False, repr=False, compare=False)
 
-    def triggers(self) -> List[str]:
-        return [t.strip() for t in (self.trigger or "").split(";") if t.strip()]
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "trigger_tuple",
+            tuple(t.strip() for t in (self.trigger or "").split(";") if t.strip()),
+        )
+        object.__setattr__(self, "kind", sys.intern((self.effect_kind or "").strip()))
+        object.__setattr__(self, "modifier_deltas", _parse_modifier_deltas(self))
 
+    def triggers(self) -> Tuple[str, ...]:
+        return self.trigger_tuple
 
-@dataclass
+
+@dataclass(slots=True)
 class PlayerState:
     pid: int
     hand: List[int] = field(default_factory=list)
     party: List[int] = field(default_factory=list)
     captured_monsters: List[int] = field(default_factory=list)
     party_leader: Optional[int] = None
-    hero_items: Dict[int, List[int]] = field(default_factory=lambda: defaultdict(list))
+    hero_items: Dict[int, List[int]] = field(default_factory=dict)
     hero_class_overrides: Dict[int, List[Tuple[int, str]]] = field(default_factory=lambda: defaultdict(list))
     actions_per_turn: int = 3
     action_points: int = 3
     roll_modifiers: List[Tuple[int, int, Optional[int]]] = field(default_factory=list)
+    # Earliest expiry turn among roll_modifiers (inf if none expire); None means unknown.
+    roll_modifiers_min_expiry: Optional[float] = field(default=None, repr=False, compare=False)
     activated_heroes_this_turn: Set[int] = field(default_factory=set)
+    passive_steps_cache: Optional[Tuple[Tuple[int, ...], List["EffectStep"]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    # roll_modifiers_min_expiry is only kept correct through these two methods; append and
+    # expire roll modifiers via them rather than touching roll_modifiers directly.
+    def add_roll_modifier(self, card_id: int, delta: int, expires_turn: Optional[int]) -> None:
+        self.roll_modifiers.append((card_id, delta, expires_turn))
+        if expires_turn is not None and self.roll_modifiers_min_expiry is not None:
+            self.roll_modifiers_min_expiry = min(self.roll_modifiers_min_expiry, expires_turn)
+
+    def expire_roll_modifiers(self, turn: int) -> None:
+        """Drop roll modifiers whose expiry turn is before turn; the list object is kept, its contents replaced."""
+        mods = self.roll_modifiers
+        if not mods:
+            return
+        min_expiry = self.roll_modifiers_min_expiry
+        if min_expiry is not None and min_expiry >= turn:
+            return
+        mods[:] = [entry for entry in mods if entry[2] is None or entry[2] >= turn]
+        self.roll_modifiers_min_expiry = min(
+            (entry[2] for entry in mods if entry[2] is not None), default=math.inf
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[PlayerState]
     draw_pile: List[int]
@@ -58,9 +177,19 @@ class GameState:
     discard_pile: List[int] = field(default_factory=list)
     turn: int = 0
     active_pid: int = 0
+    n_players: int = field(init=False)
+    opponent_of: List[int] = field(init=False)
+    # Other seats in turn order starting after pid: opponents_ring[pid] == (pid+1, pid+2, ...) mod n.
+    opponents_ring: List[Tuple[int, ...]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        n = len(self.players)
+        self.n_players = n
+        self.opponent_of = [(pid + 1) % n for pid in range(n)]
+        self.opponents_ring = [tuple((pid + offset) % n for offset in range(1, n)) for pid in range(n)]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MonsterRule:
     monster_id: int
     success_condition: Optional[str]
@@ -68,6 +197,17 @@ class MonsterRule:
     success_action: Optional[str]
     fail_action: Optional[str]
     attack_requirements: Optional[Dict[str, int]] = None
+    # (op, target) parsed from the conditions once; None when blank or unparseable.
+    success_goal: Optional[Tuple[str, int]] = field(init=False, repr=False, compare=False)
+    fail_goal: Optional[Tuple[str, int]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "success_goal", parse_roll_condition(self.success_condition) if self.success_condition else None
+        )
+        object.__setattr__(
+            self, "fail_goal", parse_roll_condition(self.fail_condition) if self.fail_condition else None
+        )
 
 
 @dataclass
@@ -93,6 +233,8 @@ class Policy:
     def __post_init__(self) -> None:
         if not self.feature_weights:
             self.feature_weights = self.default_feature_weights()
+        else:
+            self.feature_weights = self._sanitize_feature_weights(self.feature_weights)
         if self.weights_path:
             self.load_feature_weights(self.weights_path)
 
@@ -146,6 +288,10 @@ class Policy:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(self.feature_weights, f, indent=2, sort_keys=True, allow_nan=False)
 
+    def set_weight(self, name: str, value: float) -> None:
+        # feature_weights only ever holds finite values; readers rely on that.
+        self.feature_weights[name] = value if math.isfinite(value) else 0.0
+
     def _sanitize_feature_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
         sanitized: Dict[str, float] = {}
         for key, value in weights.items():
@@ -159,60 +305,45 @@ class Policy:
         return sanitized
 
     def expand_feature_weights_for_engine(self, engine: "Engine") -> None:
-        for card_id, meta in engine.card_meta.items():
-            self.feature_weights.setdefault(f"card:{card_id}", 0.0)
-            ctype = str(meta.get("type", "")).strip().lower()
+        for card_id, ctype in engine.card_types.items():
+            card_key, monster_key = _card_feature_keys(card_id)
+            self.feature_weights.setdefault(card_key, 0.0)
             if ctype == "monster":
-                self.feature_weights.setdefault(f"monster:{card_id}", 0.0)
+                self.feature_weights.setdefault(monster_key, 0.0)
 
     def score_card_value(self, card_id: int, engine: "Engine") -> int:
-        meta = engine.card_meta.get(card_id, {})
-        tuned = meta.get("tuning_value")
-        ctype = str(meta.get("type", "unknown")).lower()
-        card_adjust = self.feature_weights.get(f"card:{card_id}", 0.0)
+        parts = engine.card_value_parts.get(card_id)
+        if parts is None:
+            parts = _card_value_parts(card_id, "unknown", None, 1)
+        tuned_value, fallback, card_key, monster_key = parts
+        weights = self.feature_weights
+        card_adjust = weights.get(card_key, 0.0)
         if not math.isfinite(card_adjust):
             card_adjust = 0.0
         monster_adjust = 0.0
-        if ctype == "monster":
-            monster_adjust = self.feature_weights.get(f"monster:{card_id}", 0.0)
+        if monster_key is not None:
+            monster_adjust = weights.get(monster_key, 0.0)
             if not math.isfinite(monster_adjust):
                 monster_adjust = 0.0
-        if tuned is not None:
-            try:
-                tuned_value = float(tuned)
-            except (TypeError, ValueError):
-                tuned_value = None
-            if tuned_value is not None and math.isfinite(tuned_value):
-                adjusted = tuned_value + card_adjust + monster_adjust
-                if not math.isfinite(adjusted):
-                    adjusted = tuned_value
-                return int(round(adjusted))
-        cost = int(meta.get("action_cost", 1) or 1)
-        base = {
-            "hero": 60,
-            "item": 45,
-            "magic": 35,
-            "challenge": 25,
-            "modifier": 15,
-            "monster": 5,
-            "party_leader": 80,
-        }.get(ctype, 20)
-        adjusted = base + cost + card_adjust + monster_adjust
+        if tuned_value is not None:
+            adjusted = tuned_value + card_adjust + monster_adjust
+            if not math.isfinite(adjusted):
+                adjusted = tuned_value
+            return int(round(adjusted))
+        adjusted = fallback + card_adjust + monster_adjust
         if not math.isfinite(adjusted):
-            adjusted = base + cost
+            adjusted = fallback
         return int(round(adjusted))
 
     def choose_discard_card(self, hand: List[int], engine: "Engine") -> Optional[int]:
         if not hand:
             return None
-        ranked = sorted(hand, key=lambda cid: (self.score_card_value(cid, engine), cid))
-        return ranked[0]
+        return min(hand, key=lambda cid: (self.score_card_value(cid, engine), cid))
 
     def choose_steal_card(self, opp_hand: List[int], engine: "Engine") -> Optional[int]:
         if not opp_hand:
             return None
-        ranked = sorted(opp_hand, key=lambda cid: (-self.score_card_value(cid, engine), cid))
-        return ranked[0]
+        return min(opp_hand, key=lambda cid: (-self.score_card_value(cid, engine), cid))
 
     def choose_steal_hero(
         self,
@@ -222,30 +353,27 @@ class Policy:
     ) -> Optional[int]:
         if not opp_party:
             return None
-        ranked = sorted(
+        return min(
             opp_party,
             key=lambda hid: (
                 -(self.score_card_value(hid, engine) + len(opp_hero_items.get(hid, [])) * 5),
                 hid,
             ),
         )
-        return ranked[0]
 
     def choose_move_card(self, source: List[int], dest_zone: str, engine: "Engine") -> Optional[int]:
         if not source:
             return None
         if dest_zone in ("discard_pile",):
-            ranked = sorted(source, key=lambda cid: (self.score_card_value(cid, engine), cid))
-        else:
-            ranked = sorted(source, key=lambda cid: (-self.score_card_value(cid, engine), cid))
-        return ranked[0]
+            return min(source, key=lambda cid: (self.score_card_value(cid, engine), cid))
+        return min(source, key=lambda cid: (-self.score_card_value(cid, engine), cid))
 
     def choose_card_to_play(self, hand: List[int], engine: "Engine") -> Optional[int]:
-        candidates = [cid for cid in hand if str(engine.card_meta.get(cid, {}).get("type", "")).lower() != "modifier"]
+        modifier_ids = engine.modifier_card_ids
+        candidates = [cid for cid in hand if cid not in modifier_ids]
         if not candidates:
             return None
-        ranked = sorted(candidates, key=lambda cid: (-self.score_card_value(cid, engine), cid))
-        return ranked[0]
+        return min(candidates, key=lambda cid: (-self.score_card_value(cid, engine), cid))
 
     def choose_item_attach_target(
         self,
@@ -258,52 +386,45 @@ class Policy:
         available = [hid for hid in party if not hero_items.get(hid)]
         if not available:
             return None
-        ranked = sorted(
+        return min(
             available,
             key=lambda hid: (-self.score_card_value(hid, engine), hid),
         )
-        return ranked[0]
 
     def choose_item_to_destroy(self, items: List[int], engine: "Engine") -> Optional[int]:
         if not items:
             return None
-        ranked = sorted(items, key=lambda cid: (-self.score_card_value(cid, engine), cid))
-        return ranked[0]
+        return min(items, key=lambda cid: (-self.score_card_value(cid, engine), cid))
 
     def choose_monster_to_attack(self, monster_row: List[int], engine: "Engine") -> Optional[int]:
         if not monster_row:
             return None
-        ranked = sorted(monster_row, key=lambda mid: (-self.score_card_value(mid, engine), mid))
-        return ranked[0]
+        return min(monster_row, key=lambda mid: (-self.score_card_value(mid, engine), mid))
 
     def choose_challenger(self, state: "GameState", engine: "Engine", pid_playing: int) -> Optional[Tuple[int, int]]:
         candidates: List[Tuple[int, int]] = []
-        n = len(state.players)
-        for offset in range(1, n):
-            opid = (pid_playing + offset) % n
-            ccid = find_challenge_card_in_hand(state.players[opid], engine.card_meta)
+        challenge_ids = engine.challenge_card_ids
+        for opid in state.opponents_ring[pid_playing]:
+            ccid = find_challenge_card_in_hand(state.players[opid], challenge_ids)
             if ccid is not None:
                 candidates.append((opid, ccid))
         if not candidates:
             return None
-        ranked = sorted(
+        return min(
             candidates,
             key=lambda pair: (-len(state.players[pair[0]].hand), pair[0]),
         )
-        return ranked[0]
 
     def choose_trade_partner(self, state: "GameState", pid: int) -> Optional[int]:
         candidates = [p for p in state.players if p.pid != pid]
         if not candidates:
             return None
-        ranked = sorted(candidates, key=lambda p: (-len(p.hand), p.pid))
-        return ranked[0].pid
+        return min(candidates, key=lambda p: (-len(p.hand), p.pid)).pid
 
     def choose_reveal_opponent(self, candidates: List["PlayerState"]) -> Optional[int]:
         if not candidates:
             return None
-        ranked = sorted(candidates, key=lambda p: (-len(p.hand), p.pid))
-        return ranked[0].pid
+        return min(candidates, key=lambda p: (-len(p.hand), p.pid)).pid
 
     def choose_reveal_card(self, opp_hand: List[int], engine: "Engine") -> Optional[int]:
         return self.choose_steal_card(opp_hand, engine)
@@ -335,36 +456,13 @@ class Policy:
                 cost += self.score_card_value(source_id, engine) * self.roll.modifier_value_weight
         return cost
 
-    def _hero_class(self, engine: "Engine", player: "PlayerState", hero_id: int) -> Optional[str]:
-        overrides = player.hero_class_overrides.get(hero_id)
-        if overrides:
-            return overrides[-1][1].strip().lower() or None
-        subtype = str(engine.card_meta.get(hero_id, {}).get("subtype", "")).strip().lower()
-        return subtype or None
-
-    def _party_classes(self, engine: "Engine", player: "PlayerState") -> Set[str]:
-        classes: Set[str] = set()
-        for hero_id in player.party:
-            hero_class = self._hero_class(engine, player, hero_id)
-            if hero_class:
-                classes.add(hero_class)
-        if player.party_leader is not None:
-            leader_class = str(engine.card_meta.get(player.party_leader, {}).get("subtype", "")).strip().lower()
-            if leader_class:
-                classes.add(leader_class)
-        return classes
-
-    def _required_hero_classes(self, engine: "Engine") -> Set[str]:
-        return {
-            str(meta.get("subtype", "")).strip().lower()
-            for meta in engine.card_meta.values()
-            if str(meta.get("type", "")).strip().lower()
-            in ("hero", "party_leader", "party leader", "leader", "party-leader")
-            and str(meta.get("subtype", "")).strip()
-        }
+    def _party_classes(self, engine: "Engine", player: "PlayerState") -> FrozenSet[str]:
+        from .game_helpers import collect_party_classes
+
+        return collect_party_classes(engine, player)
 
     def _party_class_progress(self, engine: "Engine", player: "PlayerState") -> float:
-        required = self._required_hero_classes(engine)
+        required = engine.required_hero_classes
         if not required:
             return 0.0
         collected = self._party_classes(engine, player)
@@ -373,22 +471,35 @@ class Policy:
     def _action_point_efficiency(self, player: "PlayerState", cost: int) -> float:
         return (player.action_points - cost) / max(player.actions_per_turn, 1)
 
+    def _player_features(self, engine: "Engine", player: "PlayerState") -> Tuple[float, float, float, float]:
+        # Base features that depend only on the player, not on the action scored.
+        return (
+            float(len(player.captured_monsters)),
+            self._party_class_progress(engine, player),
+            float(len(player.hand)),
+            float(len(player.party)),
+        )
+
     def _base_action_features(
         self,
         state: "GameState",
         engine: "Engine",
         pid: int,
         cost: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
     ) -> Dict[str, float]:
         player = state.players[pid]
+        if player_features is None:
+            player_features = self._player_features(engine, player)
+        monsters_captured, party_class_progress, hand_size, party_size = player_features
         return {
             "bias": 1.0,
             "action_cost": float(cost),
             "action_point_efficiency": self._action_point_efficiency(player, cost),
-            "monsters_captured": float(len(player.captured_monsters)),
-            "party_class_progress": self._party_class_progress(engine, player),
-            "hand_size": float(len(player.hand)),
-            "party_size": float(len(player.party)),
+            "monsters_captured": monsters_captured,
+            "party_class_progress": party_class_progress,
+            "hand_size": hand_size,
+            "party_size": party_size,
         }
 
     def extract_attack_features(
@@ -397,8 +508,9 @@ class Policy:
         state: "GameState",
         engine: "Engine",
         pid: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
     ) -> Dict[str, float]:
-        features = self._base_action_features(state, engine, pid, action.cost)
+        features = self._base_action_features(state, engine, pid, action.cost, player_features)
         monster_id = action.monster_id or 0
         remaining = max(0, 3 - len(state.players[pid].captured_monsters))
         features.update(
@@ -409,8 +521,9 @@ class Policy:
             }
         )
         if monster_id > 0:
-            features[f"card:{monster_id}"] = 1.0
-            features[f"monster:{monster_id}"] = 1.0
+            card_key, monster_key = _card_feature_keys(monster_id)
+            features[card_key] = 1.0
+            features[monster_key] = 1.0
         return features
 
     def extract_activate_features(
@@ -419,15 +532,14 @@ class Policy:
         state: "GameState",
         engine: "Engine",
         pid: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
     ) -> Dict[str, float]:
-        features = self._base_action_features(state, engine, pid, action.cost)
+        features = self._base_action_features(state, engine, pid, action.cost, player_features)
         hero_id = action.hero_id or 0
-        remaining = sum(
-            1
-            for hid in state.players[pid].party
-            if hid not in state.players[pid].activated_heroes_this_turn
-            and any("on_activation" in s.triggers() for s in engine.effects_by_card.get(hid, []))
-        )
+        player = state.players[pid]
+        activated = player.activated_heroes_this_turn
+        activatable = engine.on_activation_heroes
+        remaining = sum(1 for hid in player.party if hid not in activated and hid in activatable)
         features.update(
             {
                 "is_activate": 1.0,
@@ -436,7 +548,7 @@ class Policy:
             }
         )
         if hero_id > 0:
-            features[f"card:{hero_id}"] = 1.0
+            features[_card_feature_keys(hero_id)[0]] = 1.0
         return features
 
     def extract_play_features(
@@ -445,12 +557,12 @@ class Policy:
         state: "GameState",
         engine: "Engine",
         pid: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
     ) -> Dict[str, float]:
-        features = self._base_action_features(state, engine, pid, action.cost)
+        features = self._base_action_features(state, engine, pid, action.cost, player_features)
         card_id = action.card_id or 0
-        meta = engine.card_meta.get(card_id, {})
-        ctype = str(meta.get("type", "")).strip().lower()
-        subtype = str(meta.get("subtype", "")).strip().lower()
+        ctype = engine.card_types.get(card_id, "")
+        subtype = engine.card_subtypes.get(card_id, "")
         adds_class = 0.0
         if ctype == "hero" and subtype:
             existing = self._party_classes(engine, state.players[pid])
@@ -469,7 +581,7 @@ class Policy:
             }
         )
         if card_id > 0:
-            features[f"card:{card_id}"] = 1.0
+            features[_card_feature_keys(card_id)[0]] = 1.0
         return features
 
     def extract_draw_features(
@@ -478,11 +590,30 @@ class Policy:
         state: "GameState",
         engine: "Engine",
         pid: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
     ) -> Dict[str, float]:
-        features = self._base_action_features(state, engine, pid, action.cost)
+        features = self._base_action_features(state, engine, pid, action.cost, player_features)
         features.update({"is_draw": 1.0, "draw_pile_size": float(len(state.draw_pile))})
         return features
 
+    def extract_features(
+        self,
+        action: "ActionCandidate",
+        state: "GameState",
+        engine: "Engine",
+        pid: int,
+        player_features: Optional[Tuple[float, float, float, float]] = None,
+    ) -> Dict[str, float]:
+        if action.kind == "attack_monster":
+            return self.extract_attack_features(action, state, engine, pid, player_features)
+        if action.kind == "activate_hero":
+            return self.extract_activate_features(action, state, engine, pid, player_features)
+        if action.kind == "play_card":
+            return self.extract_play_features(action, state, engine, pid, player_features)
+        if action.kind == "draw":
+            return self.extract_draw_features(action, state, engine, pid, player_features)
+        return self._base_action_features(state, engine, pid, action.cost, player_features)
+
     def score_action(
         self,
         action: "ActionCandidate",
@@ -490,37 +621,133 @@ class Policy:
         engine: "Engine",
         pid: int,
     ) -> float:
-        if action.kind == "attack_monster":
-            features = self.extract_attack_features(action, state, engine, pid)
-        elif action.kind == "activate_hero":
-            features = self.extract_activate_features(action, state, engine, pid)
-        elif action.kind == "play_card":
-            features = self.extract_play_features(action, state, engine, pid)
-        elif action.kind == "draw":
-            features = self.extract_draw_features(action, state, engine, pid)
-        else:
-            features = self._base_action_features(state, engine, pid, action.cost)
+        return self.score_features(self.extract_features(action, state, engine, pid))
+
+    def score_actions(
+        self,
+        actions: List["ActionCandidate"],
+        state: "GameState",
+        engine: "Engine",
+        pid: int,
+    ) -> List[float]:
+        """Scores several candidates for the same player, sharing the per-player base features."""
+        player_features = self._player_features(engine, state.players[pid])
+        return [
+            self.score_features(self.extract_features(action, state, engine, pid, player_features))
+            for action in actions
+        ]
+
+    def score_features(self, features: Dict[str, float]) -> float:
+        get_weight = self.feature_weights.get
+        isfinite = math.isfinite
         score = 0.0
         for name, value in features.items():
-            if not math.isfinite(value):
+            if not isfinite(value):
                 continue
-            weight = self.feature_weights.get(name, 0.0)
-            if not math.isfinite(weight):
-                weight = 0.0
-            score += weight * value
+            score += get_weight(name, 0.0) * value
         return score
 
 
-@dataclass
+@dataclass(slots=True)
 class Engine:
     effects_by_card: Dict[int, List[EffectStep]]
     card_meta: Dict[int, Dict[str, Any]]
     monster_attack_rules: Dict[int, MonsterRule]
     monster_effects: Dict[int, List[EffectStep]]
-    modifier_options_by_card_id: Dict[int, List[int]]
+    modifier_options_by_card_id: Dict[int, Tuple[int, ...]]
+    required_hero_classes: FrozenSet[str] = field(init=False)
+    monster_passive_effects: Dict[int, List[EffectStep]] = field(init=False)
+    deck_templates: Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]] = field(init=False, repr=False)
+    card_value_parts: Dict[int, Tuple[Optional[float], int, str, Optional[str]]] = field(init=False, repr=False)
+    on_activation_heroes: FrozenSet[int] = field(init=False, repr=False)
+    on_play_steps: Dict[int, Tuple[EffectStep, ...]] = field(init=False, repr=False)
+    challenge_card_ids: FrozenSet[int] = field(init=False, repr=False)
+    modifier_card_ids: FrozenSet[int] = field(init=False, repr=False)
+    card_types: Dict[int, str] = field(init=False, repr=False)
+    card_subtypes: Dict[int, str] = field(init=False, repr=False)
+    card_names: Dict[int, str] = field(init=False, repr=False)
+    card_labels: Dict[int, str] = field(init=False, repr=False)
+    card_tuning_values: Dict[int, float] = field(init=False, repr=False)
+    item_roll_modifiers: Dict[int, Tuple[int, ...]] = field(init=False, repr=False)
+    monster_steps_by_trigger: Dict[str, Dict[int, Tuple[EffectStep, ...]]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        from .setup import build_decks
+
+        # Flat per-field tables for the hot lookups; card_meta stays the full record, untouched.
+        self.card_types = {cid: normalize_card_text(meta.get("type", "")) for cid, meta in self.card_meta.items()}
+        self.card_subtypes = {
+            cid: normalize_card_text(meta.get("subtype", "")) for cid, meta in self.card_meta.items()
+        }
+        self.card_names = {cid: meta.get("name", "?") for cid, meta in self.card_meta.items()}
+        # "id:name" as printed by format_card_list in the turn logs.
+        self.card_labels = {cid: f"{cid}:{name}" for cid, name in self.card_names.items()}
+        self.card_tuning_values = {
+            cid: meta["tuning_value"]
+            for cid, meta in self.card_meta.items()
+            if isinstance(meta.get("tuning_value"), (int, float))
+        }
+        self.card_value_parts = {
+            cid: _card_value_parts(
+                cid, self.card_types[cid], self.card_tuning_values.get(cid), meta.get("action_cost", 1)
+            )
+            for cid, meta in self.card_meta.items()
+        }
+        self.required_hero_classes = frozenset(
+            self.card_subtypes[cid]
+            for cid, ctype in self.card_types.items()
+            if ctype in ("hero", "party_leader", "party leader", "leader", "party-leader")
+            and self.card_subtypes[cid]
+        )
+        self.monster_passive_effects = {
+            mid: [step for step in steps if "passive" in step.triggers()]
+            for mid, steps in self.monster_effects.items()
+        }
+        self.challenge_card_ids = frozenset(
+            cid for cid, ctype in self.card_types.items() if ctype == "challenge"
+        )
+        self.modifier_card_ids = frozenset(
+            cid for cid, ctype in self.card_types.items() if ctype == "modifier"
+        )
+        self.on_activation_heroes = frozenset(
+            cid for cid, steps in self.effects_by_card.items() if any("on_activation" in s.triggers() for s in steps)
+        )
+        # Steps that fire when their card is played, in step order.
+        self.on_play_steps = {}
+        for cid, steps in self.effects_by_card.items():
+            fired = tuple(step for step in steps if not _PLAY_TRIGGERS.isdisjoint(step.triggers()))
+            if fired:
+                self.on_play_steps[cid] = fired
+        # Passive modify_hero_roll amounts per item, in step order.
+        self.item_roll_modifiers = {}
+        for cid, steps in self.effects_by_card.items():
+            amounts = tuple(
+                step.amount
+                for step in steps
+                if (step.effect_kind or "").strip().lower() == "modify_hero_roll"
+                and "passive" in step.triggers()
+                and step.amount is not None
+            )
+            if amounts:
+                self.item_roll_modifiers[cid] = amounts
+        # Captured-monster steps per trigger name, in step order, so trigger hooks skip the scan.
+        by_trigger: Dict[str, Dict[int, List[EffectStep]]] = {}
+        for mid, steps in self.monster_effects.items():
+            for step in steps:
+                for trigger in dict.fromkeys(step.triggers()):
+                    by_trigger.setdefault(trigger, {}).setdefault(mid, []).append(step)
+        self.monster_steps_by_trigger = {
+            trigger: {mid: tuple(steps) for mid, steps in by_monster.items()}
+            for trigger, by_monster in by_trigger.items()
+        }
+        draw_deck, monster_deck, leader_deck = build_decks(self.card_meta)
+        self.deck_templates = (tuple(draw_deck), tuple(monster_deck), tuple(leader_deck))
+
+    def monster_trigger_steps(self, monster_id: int, trigger: str) -> Tuple[EffectStep, ...]:
+        return self.monster_steps_by_trigger.get(trigger, _NO_MONSTER_STEPS).get(monster_id, ())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ActionCandidate:
     kind: str
     cost: int
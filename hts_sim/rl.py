@@ -4,15 +4,21 @@ import json
 import math
 import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from .actions import apply_action_candidate, build_action_candidates
 from .effects import resolve_effect
-from .game_helpers import collect_party_classes
+from .game import check_win_conditions
+from .game_helpers import (
+    collect_party_classes,
+    passive_monster_steps,
+)
 from .loaders import build_engine
-from .models import GameState, PlayerState, Policy
-from .setup import build_decks, setup_game
+from .models import ActionCandidate, Engine, GameState, PlayerState, Policy
+from .setup import setup_game, shuffled_decks
+from .utils import first_in_order
 
 
 @dataclass(frozen=True)
@@ -96,6 +102,18 @@ def save_transitions(path: str, transitions: List[Transition]) -> None:
         json.dump(payload, f, indent=2, sort_keys=True, allow_nan=False)
 
 
+def _apply_td_update(weights: Dict[str, float], features: Dict[str, float], step: float) -> None:
+    # step is alpha * td_error, hoisted out of the per-feature loop.
+    isfinite = math.isfinite
+    get_weight = weights.get
+    for name, value in features.items():
+        if not isfinite(value):
+            continue
+        # Weights are kept finite at write time, so only the new value needs checking.
+        weight = get_weight(name, 0.0) + step * value
+        weights[name] = weight if isfinite(weight) else 0.0
+
+
 def replay_transitions(
     policy: Policy,
     transitions: List[Transition],
@@ -113,25 +131,17 @@ def replay_transitions(
         td_error = td_target - action_score
         if not math.isfinite(td_error):
             continue
-        for name, value in features.items():
-            if not math.isfinite(value):
-                continue
-            current_weight = policy.feature_weights.get(name, 0.0)
-            if not math.isfinite(current_weight):
-                current_weight = 0.0
-            policy.feature_weights[name] = current_weight + alpha * td_error * value
+        _apply_td_update(policy.feature_weights, features, alpha * td_error)
 
 
-def _required_hero_classes(engine) -> set:
-    return {
-        str(meta.get("subtype", "")).strip().lower()
-        for meta in engine.card_meta.values()
-        if str(meta.get("type", "")).strip().lower() in ("hero", "party_leader", "party leader", "leader", "party-leader")
-        and str(meta.get("subtype", "")).strip()
-    }
+@dataclass(frozen=True, slots=True)
+class _RewardSnapshot:
+    captured_count: int
+    party_classes: FrozenSet[str]
+    summary: Dict[str, float]
 
 
-def _summarize_state(engine, player: PlayerState, required_classes: set) -> Dict[str, float]:
+def _summarize_state(engine, player: PlayerState, required_classes: FrozenSet[str]) -> Dict[str, float]:
     party_classes = collect_party_classes(engine, player)
     progress = len(party_classes) / max(len(required_classes), 1) if required_classes else 0.0
     return {
@@ -143,38 +153,37 @@ def _summarize_state(engine, player: PlayerState, required_classes: set) -> Dict
     }
 
 
-def _check_win_conditions(state: GameState, engine) -> Optional[int]:
-    required_classes = _required_hero_classes(engine)
-    for player in state.players:
-        if len(player.captured_monsters) >= 3:
-            return player.pid
-        party_classes = collect_party_classes(engine, player)
-        if required_classes and required_classes.issubset(party_classes):
-            return player.pid
-    return None
+def _snapshot_for_reward(engine, player: PlayerState, required_classes: FrozenSet[str]) -> _RewardSnapshot:
+    # Only what the reward and the transition record read; no copies of hand, party or items.
+    return _RewardSnapshot(
+        captured_count=len(player.captured_monsters),
+        party_classes=collect_party_classes(engine, player),
+        summary=_summarize_state(engine, player, required_classes),
+    )
 
 
 def _compute_reward_delta(
     engine,
-    player_before: PlayerState,
+    before: _RewardSnapshot,
     player_after: PlayerState,
-    required_classes: set,
+    required_classes: FrozenSet[str],
     config: RewardConfig,
     action_taken: bool,
 ) -> float:
     reward = 0.0
-    captured_before = len(player_before.captured_monsters)
     captured_after = len(player_after.captured_monsters)
-    reward += (captured_after - captured_before) * config.monster_capture
+    reward += (captured_after - before.captured_count) * config.monster_capture
 
-    classes_before = collect_party_classes(engine, player_before)
+    classes_before = before.party_classes
     classes_after = collect_party_classes(engine, player_after)
-    progress_before = len(classes_before) / max(len(required_classes), 1) if required_classes else 0.0
-    progress_after = len(classes_after) / max(len(required_classes), 1) if required_classes else 0.0
-    reward += max(progress_after - progress_before, 0.0) * config.party_class_progress
+    if required_classes:
+        n_required = len(required_classes)
+        progress_before = len(classes_before) / n_required
+        progress_after = len(classes_after) / n_required
+        reward += max(progress_after - progress_before, 0.0) * config.party_class_progress
 
-    if required_classes and required_classes.issubset(classes_after) and not required_classes.issubset(classes_before):
-        reward += config.party_class_completion
+        if required_classes <= classes_after and not required_classes <= classes_before:
+            reward += config.party_class_completion
 
     if not action_taken:
         reward += config.wasted_action
@@ -182,31 +191,19 @@ def _compute_reward_delta(
 
 
 def _action_value_reward(action, engine, config: RewardConfig) -> float:
-    if action.kind == "play_card" and action.card_id:
-        value = engine.card_meta.get(action.card_id, {}).get("tuning_value")
-        if isinstance(value, (int, float)):
-            return value * config.card_play_value
-    if action.kind == "attack_monster" and action.monster_id:
-        value = engine.card_meta.get(action.monster_id, {}).get("tuning_value")
-        if isinstance(value, (int, float)):
-            return value * config.monster_attack_value
-    if action.kind == "activate_hero" and action.hero_id:
-        value = engine.card_meta.get(action.hero_id, {}).get("tuning_value")
-        if isinstance(value, (int, float)):
-            return value * config.hero_activation_value
-    return 0.0
-
-
-def _action_features(policy: Policy, action, state: GameState, engine, pid: int) -> Dict[str, float]:
-    if action.kind == "attack_monster":
-        return policy.extract_attack_features(action, state, engine, pid)
-    if action.kind == "activate_hero":
-        return policy.extract_activate_features(action, state, engine, pid)
-    if action.kind == "play_card":
-        return policy.extract_play_features(action, state, engine, pid)
-    if action.kind == "draw":
-        return policy.extract_draw_features(action, state, engine, pid)
-    return {}
+    kind = action.kind
+    if kind == "play_card":
+        card_id, multiplier = action.card_id, config.card_play_value
+    elif kind == "attack_monster":
+        card_id, multiplier = action.monster_id, config.monster_attack_value
+    elif kind == "activate_hero":
+        card_id, multiplier = action.hero_id, config.hero_activation_value
+    else:
+        return 0.0
+    if not card_id:
+        return 0.0
+    value = engine.card_tuning_values.get(card_id)
+    return 0.0 if value is None else value * multiplier
 
 
 def _describe_action_candidate(action, engine) -> str:
@@ -218,13 +215,208 @@ def _describe_action_candidate(action, engine) -> str:
         return f"activate_hero hero={action.hero_id}:{meta.get('name','?')}"
     if action.kind == "play_card" and action.card_id is not None:
         meta = engine.card_meta.get(action.card_id, {})
-        ctype = str(meta.get("type", "unknown")).strip().lower()
+        ctype = engine.card_types.get(action.card_id, "unknown")
         return f"play_card card={action.card_id}:{meta.get('name','?')} type={ctype}"
     if action.kind == "draw":
         return "draw"
     return action.kind
 
 
+def _greedy_action(
+    policy: Policy,
+    candidates: List[ActionCandidate],
+    state: GameState,
+    engine: Engine,
+    pid: int,
+) -> ActionCandidate:
+    scored = list(zip(policy.score_actions(candidates, state, engine, pid), candidates))
+    return first_in_order(scored, key=lambda pair: (-pair[0], pair[1].kind))[1]
+
+
+def _run_episode(
+    engine: Engine,
+    policy: Policy,
+    rng: random.Random,
+    episode: int,
+    turns: int,
+    n_players: int,
+    epsilon: float,
+    alpha: float,
+    gamma: float,
+    reward_config: RewardConfig,
+    debug_enabled: bool,
+) -> Tuple[Optional[int], List[Transition]]:
+    """Play one training episode, updating ``policy`` in place after every action."""
+    transitions: List[Transition] = []
+    draw_deck, monster_deck, leader_deck = shuffled_decks(engine, rng)
+
+    players = [PlayerState(pid=i) for i in range(n_players)]
+    state = GameState(
+        players=players,
+        draw_pile=draw_deck,
+        monster_deck=monster_deck,
+        party_leader_deck=leader_deck,
+    )
+    setup_game(state, engine, rng, None)
+    required_classes = engine.required_hero_classes
+
+    winner_pid: Optional[int] = None
+    for t in range(turns):
+        state.turn = t + 1
+        for player in state.players:
+            player.expire_roll_modifiers(state.turn)
+        pid = t % len(state.players)
+        state.active_pid = pid
+        active = state.players[pid]
+        active.activated_heroes_this_turn.clear()
+        active.actions_per_turn = 3
+        passive_log: Optional[List[str]] = [] if debug_enabled else None
+        for step in passive_monster_steps(engine, active):
+            resolve_effect(step, state, engine, pid, {}, rng, policy, passive_log)
+        if debug_enabled and passive_log:
+            for entry in passive_log:
+                print(f"[train][debug] {entry}")
+        active.action_points = active.actions_per_turn
+
+        safety = 30
+        # Candidates built for the previous step's next-Q estimate; the state has not changed since.
+        pending_candidates: Optional[List[ActionCandidate]] = None
+        while active.action_points > 0 and safety > 0:
+            if pending_candidates is not None:
+                candidates = pending_candidates
+            else:
+                candidates = build_action_candidates(state, engine, pid)
+            if not candidates:
+                if debug_enabled:
+                    print(
+                        "[train][debug] no action candidates; "
+                        f"episode={episode + 1} turn={state.turn} pid={pid} action_points={active.action_points}."
+                    )
+                break
+
+            if rng.random() < epsilon:
+                action = rng.choice(candidates)
+            else:
+                action = _greedy_action(policy, candidates, state, engine, pid)
+
+            before = _snapshot_for_reward(engine, active, required_classes)
+
+            if debug_enabled:
+                action_summary = _describe_action_candidate(action, engine)
+                print(
+                    "[train][debug] action selected; "
+                    f"episode={episode + 1} turn={state.turn} pid={pid} action={action_summary} "
+                    f"action_points={active.action_points} candidates={len(candidates)} safety={safety}."
+                )
+            features = policy.extract_features(action, state, engine, pid)
+            current_q = policy.score_features(features)
+            action_log: Optional[List[str]] = [] if debug_enabled else None
+            action_taken = apply_action_candidate(action, state, engine, pid, rng, policy, action_log)
+            if debug_enabled and action_log:
+                for entry in action_log:
+                    print(f"[train][debug] {entry}")
+
+            reward = _compute_reward_delta(
+                engine,
+                before,
+                active,
+                required_classes,
+                reward_config,
+                action_taken,
+            )
+            reward += _action_value_reward(action, engine, reward_config)
+            winner_pid = check_win_conditions(state, engine, None)
+            terminal = winner_pid is not None
+            if terminal:
+                reward += reward_config.win if winner_pid == pid else reward_config.loss
+
+            next_candidates = build_action_candidates(state, engine, pid) if not terminal else []
+            pending_candidates = next_candidates
+            next_q = max(
+                (
+                    score
+                    for score in policy.score_actions(next_candidates, state, engine, pid)
+                    if math.isfinite(score)
+                ),
+                default=0.0,
+            )
+            td_target = reward + gamma * next_q
+            td_error = td_target - current_q
+            if features and math.isfinite(td_error):
+                _apply_td_update(policy.feature_weights, features, alpha * td_error)
+
+            transitions.append(
+                Transition(
+                    state=before.summary,
+                    action={"kind": action.kind, "score": current_q},
+                    reward=reward,
+                    next_state=_summarize_state(engine, active, required_classes),
+                    terminal=terminal,
+                    features=features,
+                    next_max_q=next_q,
+                )
+            )
+
+            if terminal:
+                if debug_enabled:
+                    print(
+                        "[train][debug] terminal reached; "
+                        f"episode={episode + 1} turn={state.turn} pid={pid} winner={winner_pid}."
+                    )
+                break
+            safety -= 1
+            if debug_enabled and safety == 0:
+                print(
+                    "[train][debug] safety exhausted; "
+                    f"episode={episode + 1} turn={state.turn} pid={pid} action_points={active.action_points}."
+                )
+        if winner_pid is not None:
+            break
+    return winner_pid, transitions
+
+
+_worker_engine: Optional[Engine] = None
+
+
+def _init_episode_worker(engine: Engine) -> None:
+    # Ship the engine once per worker process rather than once per episode.
+    global _worker_engine
+    _worker_engine = engine
+
+
+def _run_episode_worker(
+    job: Tuple[Dict[str, float], int, int, int, int, float, float, float, RewardConfig, bool],
+) -> Tuple[Optional[int], List[Transition], Dict[str, float]]:
+    weights, episode_seed, episode, turns, n_players, epsilon, alpha, gamma, reward_config, debug_enabled = job
+    engine = _worker_engine or build_engine()
+    policy = Policy(feature_weights=dict(weights))
+    winner_pid, transitions = _run_episode(
+        engine,
+        policy,
+        random.Random(episode_seed),
+        episode,
+        turns,
+        n_players,
+        epsilon,
+        alpha,
+        gamma,
+        reward_config,
+        debug_enabled,
+    )
+    deltas = {
+        name: value - weights.get(name, 0.0)
+        for name, value in policy.feature_weights.items()
+        if value != weights.get(name, 0.0)
+    }
+    return winner_pid, transitions, deltas
+
+
+def _log_episode_outcome(episode: int, episodes: int, winner_pid: Optional[int], log_every: int) -> None:
+    if log_every > 0 and (episode + 1) % log_every == 0:
+        outcome = "tie" if winner_pid is None else f"winner pid {winner_pid}"
+        print(f"[train] episode {episode + 1}/{episodes} complete ({outcome}).")
+
+
 def train_policy(
     episodes: int = 25,
     turns: int = 12,
@@ -239,9 +431,11 @@ def train_policy(
     debug: bool = False,
     replay_data: Optional[List[Transition]] = None,
     replay_epochs: int = 1,
+    workers: int = 1,
+    engine: Optional[Engine] = None,
 ) -> Tuple[Policy, List[Transition]]:
     rng = random.Random(seed)
-    engine = build_engine()
+    engine = engine or build_engine()
     policy = Policy(weights_path=weights_path)
     policy.expand_feature_weights_for_engine(engine)
     transitions: List[Transition] = []
@@ -250,229 +444,171 @@ def train_policy(
         for _ in range(max(replay_epochs, 1)):
             replay_transitions(policy, replay_data, alpha, gamma)
 
-    for episode in range(episodes):
-        debug_enabled = debug and (log_every > 0 and (episode + 1) % log_every == 0)
-        if debug_enabled:
-            print(f"[train][debug] episode {episode + 1}/{episodes} seed={seed} starting.")
-        draw_deck, monster_deck, leader_deck = build_decks(engine.card_meta)
-        rng.shuffle(draw_deck)
-        rng.shuffle(monster_deck)
-        rng.shuffle(leader_deck)
-
-        players = [PlayerState(pid=i) for i in range(n_players)]
-        state = GameState(
-            players=players,
-            draw_pile=draw_deck,
-            monster_deck=monster_deck,
-            party_leader_deck=leader_deck,
-        )
-        setup_game(state, engine, rng, [])
-        required_classes = _required_hero_classes(engine)
-
-        winner_pid: Optional[int] = None
-        for t in range(turns):
-            state.turn = t + 1
-            for player in state.players:
-                if player.roll_modifiers:
-                    player.roll_modifiers = [
-                        entry for entry in player.roll_modifiers if entry[2] is None or entry[2] >= state.turn
-                    ]
-            pid = t % len(state.players)
-            state.active_pid = pid
-            active = state.players[pid]
-            active.activated_heroes_this_turn.clear()
-            active.actions_per_turn = 3
-            for mid in active.captured_monsters:
-                passive_log: List[str] = []
-                for step in engine.monster_effects.get(mid, []):
-                    if "passive" in step.triggers():
-                        resolve_effect(step, state, engine, pid, {}, rng, policy, passive_log)
-                if debug_enabled and passive_log:
-                    for entry in passive_log:
-                        print(f"[train][debug] {entry}")
-            active.action_points = active.actions_per_turn
-
-            safety = 30
-            while active.action_points > 0 and safety > 0:
-                candidates = build_action_candidates(state, engine, pid)
-                if not candidates:
-                    if debug_enabled:
-                        print(
-                            "[train][debug] no action candidates; "
-                            f"episode={episode + 1} turn={state.turn} pid={pid} action_points={active.action_points}."
-                        )
-                    break
-
-                if rng.random() < epsilon:
-                    action = rng.choice(candidates)
-                else:
-                    scored = [(policy.score_action(c, state, engine, pid), c) for c in candidates]
-                    scored.sort(key=lambda pair: (-pair[0], pair[1].kind))
-                    action = scored[0][1]
-
-                player_snapshot = PlayerState(
-                    pid=active.pid,
-                    hand=list(active.hand),
-                    party=list(active.party),
-                    captured_monsters=list(active.captured_monsters),
-                    party_leader=active.party_leader,
-                    hero_items={k: list(v) for k, v in active.hero_items.items()},
-                    hero_class_overrides={k: list(v) for k, v in active.hero_class_overrides.items()},
-                    actions_per_turn=active.actions_per_turn,
-                    action_points=active.action_points,
-                    roll_modifiers=list(active.roll_modifiers),
-                    activated_heroes_this_turn=set(active.activated_heroes_this_turn),
-                )
-
-                if debug_enabled:
-                    action_summary = _describe_action_candidate(action, engine)
-                    print(
-                        "[train][debug] action selected; "
-                        f"episode={episode + 1} turn={state.turn} pid={pid} action={action_summary} "
-                        f"action_points={active.action_points} candidates={len(candidates)} safety={safety}."
-                    )
-                features = _action_features(policy, action, state, engine, pid)
-                current_q = policy.score_action(action, state, engine, pid)
-                action_log: List[str] = []
-                action_taken = apply_action_candidate(action, state, engine, pid, rng, policy, action_log)
-                if debug_enabled and action_log:
-                    for entry in action_log:
-                        print(f"[train][debug] {entry}")
-
-                reward = _compute_reward_delta(
-                    engine,
-                    player_snapshot,
-                    active,
-                    required_classes,
-                    reward_config,
-                    action_taken,
-                )
-                reward += _action_value_reward(action, engine, reward_config)
-                winner_pid = _check_win_conditions(state, engine)
-                terminal = winner_pid is not None
-                if terminal:
-                    reward += reward_config.win if winner_pid == pid else reward_config.loss
-
-                next_candidates = build_action_candidates(state, engine, pid) if not terminal else []
-                scored_next = []
-                for candidate in next_candidates:
-                    score = policy.score_action(candidate, state, engine, pid)
-                    if math.isfinite(score):
-                        scored_next.append(score)
-                next_q = max(scored_next, default=0.0)
-                td_target = reward + gamma * next_q
-                td_error = td_target - current_q
-                if math.isfinite(td_error):
-                    for name, value in features.items():
-                        if not math.isfinite(value):
-                            continue
-                        current_weight = policy.feature_weights.get(name, 0.0)
-                        if not math.isfinite(current_weight):
-                            current_weight = 0.0
-                        policy.feature_weights[name] = current_weight + alpha * td_error * value
-
-                transitions.append(
-                    Transition(
-                        state=_summarize_state(engine, player_snapshot, required_classes),
-                        action={"kind": action.kind, "score": current_q},
-                        reward=reward,
-                        next_state=_summarize_state(engine, active, required_classes),
-                        terminal=terminal,
-                        features=features,
-                        next_max_q=next_q,
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_episode_worker, initargs=(engine,)
+        ) as pool:
+            episode = 0
+            while episode < episodes:
+                batch = range(episode, min(episode + workers, episodes))
+                snapshot = dict(policy.feature_weights)
+                jobs = [
+                    (
+                        snapshot,
+                        rng.randrange(2**31),
+                        index,
+                        turns,
+                        n_players,
+                        epsilon,
+                        alpha,
+                        gamma,
+                        reward_config,
+                        debug and (log_every > 0 and (index + 1) % log_every == 0),
                     )
-                )
-
-                if terminal:
+                    for index in batch
+                ]
+                for job in jobs:
+                    episode_seed, index, debug_enabled = job[1], job[2], job[-1]
                     if debug_enabled:
-                        print(
-                            "[train][debug] terminal reached; "
-                            f"episode={episode + 1} turn={state.turn} pid={pid} winner={winner_pid}."
-                        )
-                    break
-                safety -= 1
-                if debug_enabled and safety == 0:
-                    print(
-                        "[train][debug] safety exhausted; "
-                        f"episode={episode + 1} turn={state.turn} pid={pid} action_points={active.action_points}."
-                    )
-            if winner_pid is not None:
-                break
-
-        if log_every > 0 and (episode + 1) % log_every == 0:
-            outcome = "tie" if winner_pid is None else f"winner pid {winner_pid}"
-            print(f"[train] episode {episode + 1}/{episodes} complete ({outcome}).")
+                        # Printed before dispatch; the per-episode seed is what identifies the worker run.
+                        print(f"[train][debug] episode {index + 1}/{episodes} seed={episode_seed} starting.")
+                summed: Dict[str, float] = {}
+                for index, (winner_pid, episode_transitions, deltas) in zip(
+                    batch, pool.map(_run_episode_worker, jobs)
+                ):
+                    transitions.extend(episode_transitions)
+                    for name, delta in deltas.items():
+                        summed[name] = summed.get(name, 0.0) + delta
+                    _log_episode_outcome(index, episodes, winner_pid, log_every)
+                for name, delta in summed.items():
+                    policy.set_weight(name, policy.feature_weights.get(name, 0.0) + delta / len(batch))
+                episode += len(batch)
+    else:
+        for episode in range(episodes):
+            debug_enabled = debug and (log_every > 0 and (episode + 1) % log_every == 0)
+            if debug_enabled:
+                print(f"[train][debug] episode {episode + 1}/{episodes} seed={seed} starting.")
+            winner_pid, episode_transitions = _run_episode(
+                engine,
+                policy,
+                rng,
+                episode,
+                turns,
+                n_players,
+                epsilon,
+                alpha,
+                gamma,
+                reward_config,
+                debug_enabled,
+            )
+            transitions.extend(episode_transitions)
+            _log_episode_outcome(episode, episodes, winner_pid, log_every)
 
     if weights_path:
         policy.save_feature_weights(weights_path)
     return policy, transitions
 
 
+def _evaluate_seed(
+    engine: Engine,
+    baseline_policy: Policy,
+    tuned_policy: Policy,
+    seed: int,
+    turns: int,
+    n_players: int,
+) -> str:
+    """Plays one evaluation game and returns the results key it counts towards."""
+    rng = random.Random(seed)
+    baseline_on_even = seed % 2 == 0
+    baseline_pids = {
+        pid
+        for pid in range(n_players)
+        if (pid % 2 == 0 and baseline_on_even) or (pid % 2 == 1 and not baseline_on_even)
+    }
+    draw_deck, monster_deck, leader_deck = shuffled_decks(engine, rng)
+
+    players = [PlayerState(pid=i) for i in range(n_players)]
+    state = GameState(
+        players=players,
+        draw_pile=draw_deck,
+        monster_deck=monster_deck,
+        party_leader_deck=leader_deck,
+    )
+    setup_game(state, engine, rng, None)
+
+    winner: Optional[int] = None
+    for t in range(turns):
+        state.turn = t + 1
+        pid = t % len(state.players)
+        state.active_pid = pid
+        p = state.players[pid]
+        p.activated_heroes_this_turn.clear()
+        p.actions_per_turn = 3
+        p.action_points = p.actions_per_turn
+
+        policy = baseline_policy if pid in baseline_pids else tuned_policy
+        while p.action_points > 0:
+            candidates = build_action_candidates(state, engine, pid)
+            if not candidates:
+                break
+            action = _greedy_action(policy, candidates, state, engine, pid)
+            apply_action_candidate(action, state, engine, pid, rng, policy, None)
+            winner = check_win_conditions(state, engine, None)
+            if winner is not None:
+                break
+        if winner is not None:
+            break
+
+    if winner is None:
+        return "ties"
+    if winner in baseline_pids:
+        return "baseline_wins"
+    return "tuned_wins"
+
+
+_worker_policies: Optional[Tuple[Policy, Policy]] = None
+
+
+def _init_evaluation_worker(engine: Engine, baseline_policy: Policy, tuned_policy: Policy) -> None:
+    global _worker_engine, _worker_policies
+    _worker_engine = engine
+    _worker_policies = (baseline_policy, tuned_policy)
+
+
+def _evaluate_seed_worker(job: Tuple[int, int, int]) -> str:
+    seed, turns, n_players = job
+    baseline_policy, tuned_policy = _worker_policies
+    return _evaluate_seed(_worker_engine, baseline_policy, tuned_policy, seed, turns, n_players)
+
+
 def evaluate_policies(
     seeds: List[int],
     turns: int = 12,
     n_players: int = 4,
     baseline_policy: Optional[Policy] = None,
     tuned_policy: Optional[Policy] = None,
+    engine: Optional[Engine] = None,
+    workers: int = 1,
 ) -> Dict[str, int]:
-    engine = build_engine()
+    engine = engine or build_engine()
     baseline_policy = baseline_policy or Policy(feature_weights=Policy.default_feature_weights())
     tuned_policy = tuned_policy or Policy(weights_path=None)
     baseline_policy.expand_feature_weights_for_engine(engine)
     tuned_policy.expand_feature_weights_for_engine(engine)
 
     results = {"baseline_wins": 0, "tuned_wins": 0, "ties": 0}
-    for seed in seeds:
-        rng = random.Random(seed)
-        baseline_on_even = seed % 2 == 0
-        baseline_pids = {
-            pid
-            for pid in range(n_players)
-            if (pid % 2 == 0 and baseline_on_even) or (pid % 2 == 1 and not baseline_on_even)
-        }
-        draw_deck, monster_deck, leader_deck = build_decks(engine.card_meta)
-        rng.shuffle(draw_deck)
-        rng.shuffle(monster_deck)
-        rng.shuffle(leader_deck)
-
-        players = [PlayerState(pid=i) for i in range(n_players)]
-        state = GameState(
-            players=players,
-            draw_pile=draw_deck,
-            monster_deck=monster_deck,
-            party_leader_deck=leader_deck,
-        )
-        setup_game(state, engine, rng, [])
-
-        winner: Optional[int] = None
-        for t in range(turns):
-            state.turn = t + 1
-            pid = t % len(state.players)
-            state.active_pid = pid
-            p = state.players[pid]
-            p.activated_heroes_this_turn.clear()
-            p.actions_per_turn = 3
-            p.action_points = p.actions_per_turn
-
-            policy = baseline_policy if pid in baseline_pids else tuned_policy
-            while p.action_points > 0:
-                candidates = build_action_candidates(state, engine, pid)
-                if not candidates:
-                    break
-                scored = [(policy.score_action(c, state, engine, pid), c) for c in candidates]
-                scored.sort(key=lambda pair: (-pair[0], pair[1].kind))
-                apply_action_candidate(scored[0][1], state, engine, pid, rng, policy, [])
-                winner = _check_win_conditions(state, engine)
-                if winner is not None:
-                    break
-            if winner is not None:
-                break
-
-        if winner is None:
-            results["ties"] += 1
-        elif winner in baseline_pids:
-            results["baseline_wins"] += 1
-        else:
-            results["tuned_wins"] += 1
+    if workers > 1 and len(seeds) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_evaluation_worker,
+            initargs=(engine, baseline_policy, tuned_policy),
+        ) as pool:
+            outcomes = list(pool.map(_evaluate_seed_worker, [(seed, turns, n_players) for seed in seeds]))
+    else:
+        outcomes = [
+            _evaluate_seed(engine, baseline_policy, tuned_policy, seed, turns, n_players) for seed in seeds
+        ]
+    for outcome in outcomes:
+        results[outcome] += 1
 
     return results
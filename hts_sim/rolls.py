@@ -1,4 +1,5 @@
-from typing import List, Optional, Tuple
+import itertools
+from typing import Callable, List, Optional, Tuple
 
 from .conditions import goal_satisfied, roll_2d6_detail
 from .models import Engine, GameState, Policy
@@ -21,28 +22,89 @@ def _collect_hero_roll_modifiers(
         total = 0
         details: List[Tuple[int, int]] = []
         for item_id in items:
-            for step in engine.effects_by_card.get(item_id, []):
-                if (step.effect_kind or "").strip().lower() != "modify_hero_roll":
-                    continue
-                if "passive" not in step.triggers():
-                    continue
-                if step.amount is None:
-                    continue
-                total += step.amount
-                details.append((item_id, step.amount))
+            for amount in engine.item_roll_modifiers.get(item_id, ()):
+                total += amount
+                details.append((item_id, amount))
         if details:
             return total, details
 
     return 0, []
 
 
+_resolve_effect = None
+
+
+def _effect_resolver():
+    # effects imports this module, so resolve_effect is bound on first use.
+    global _resolve_effect
+    if _resolve_effect is None:
+        from .effects import resolve_effect
+
+        _resolve_effect = resolve_effect
+    return _resolve_effect
+
+
+def _goal_outcome_fixed(
+    total: int,
+    goal: Optional[Tuple[str, int]],
+    sources: List[Tuple[str, int, Optional[int], Tuple[int, ...]]],
+) -> bool:
+    """True if no mix of the given modifier deltas can change whether goal is met."""
+    if not goal:
+        return True
+    op, target = goal
+    if op == "==":
+        return False
+    lowest = total + sum(min(min(deltas), 0) for _, _, _, deltas in sources)
+    highest = total + sum(max(max(deltas), 0) for _, _, _, deltas in sources)
+    # The remaining operators are monotone in the total, so checking the extremes suffices.
+    return goal_satisfied(lowest, op, target) == goal_satisfied(highest, op, target)
+
+
+def _improvement_scorer(
+    mode: str,
+    goal: Optional[Tuple[str, int]],
+    roller_pid: int,
+) -> Callable[[int, int, int], int]:
+    """Picks the (before, after, pid) scoring rule for this roll once, outside the search loops."""
+    if mode == "maximize":
+
+        def maximize_score(before: int, after: int, pid: int) -> int:
+            return (after - before) if pid == roller_pid else (before - after)
+
+        return maximize_score
+
+    if not goal:
+        return lambda before, after, pid: 0
+
+    op, target = goal
+
+    def threshold_score(before: int, after: int, pid: int) -> int:
+        before_ok = goal_satisfied(before, op, target)
+        after_ok = goal_satisfied(after, op, target)
+
+        if before_ok == after_ok:
+            return 0
+
+        if pid == roller_pid:
+            if (not before_ok) and after_ok:
+                return 1000 + abs(after - before)
+            return (after - before if op == ">=" else before - after)
+        else:
+            if before_ok and (not after_ok):
+                return 1000 + abs(after - before)
+            return (before - after if op == ">=" else after - before)
+
+    return threshold_score
+
+
 def resolve_roll_event(
     state: GameState,
     engine: Engine,
     roller_pid: int,
     roll_reason: str,
     rng: "random.Random",
-    log: List[str],
+    log: Optional[List[str]],
     policy: Policy,
     goal: Optional[Tuple[str, int]] = None,
     mode: str = "threshold",
@@ -60,116 +122,105 @@ def resolve_roll_event(
     }
     if roll_reason.startswith("challenge:"):
         for mid in state.players[roller_pid].captured_monsters:
-            for step in engine.monster_effects.get(mid, []):
-                if "on_challenge_roll" in step.triggers():
-                    from .effects import resolve_effect
-
-                    resolve_effect(step, state, engine, roller_pid, ctx, rng, policy, log)
+            for step in engine.monster_trigger_steps(mid, "on_challenge_roll"):
+                _effect_resolver()(step, state, engine, roller_pid, ctx, rng, policy, log)
     for mid in state.players[roller_pid].captured_monsters:
-        for step in engine.monster_effects.get(mid, []):
-            if "on_roll" in step.triggers():
-                from .effects import resolve_effect
-
-                resolve_effect(step, state, engine, roller_pid, ctx, rng, policy, log)
+        for step in engine.monster_trigger_steps(mid, "on_roll"):
+            _effect_resolver()(step, state, engine, roller_pid, ctx, rng, policy, log)
 
     die_one, die_two, base = roll_2d6_detail(rng)
     total = base
-    log.append(
-        f"[ROLL:{roll_reason}] P{roller_pid} base 2d6 = {base} ({die_one}+{die_two})"
-    )
+    if log is not None:
+        log.append(
+            f"[ROLL:{roll_reason}] P{roller_pid} base 2d6 = {base} ({die_one}+{die_two})"
+        )
 
     hero_mod, hero_mod_details = _collect_hero_roll_modifiers(state, engine, hero_id)
     if hero_mod:
         total += hero_mod
-        parts = ", ".join(
-            f"{item_id}:{engine.card_meta.get(item_id, {}).get('name', '?')} {delta:+d}"
-            for item_id, delta in hero_mod_details
-        )
-        log.append(
-            f"[ROLL:{roll_reason}] hero {hero_id} modifiers {hero_mod:+d} from {parts} -> total={total}"
-        )
+        if log is not None:
+            parts = ", ".join(
+                f"{item_id}:{engine.card_names.get(item_id, '?')} {delta:+d}"
+                for item_id, delta in hero_mod_details
+            )
+            log.append(
+                f"[ROLL:{roll_reason}] hero {hero_id} modifiers {hero_mod:+d} from {parts} -> total={total}"
+            )
 
     ctx_roll_mods = ctx.get("roll_modifiers") or []
     if ctx_roll_mods:
-        total += sum(entry[1] for entry in ctx_roll_mods)
-        parts = ", ".join(
-            f"{entry[0]}:{engine.card_meta.get(entry[0], {}).get('name', '?')} {entry[1]:+d}"
-            for entry in ctx_roll_mods
-        )
-        log.append(
-            f"[ROLL:{roll_reason}] P{roller_pid} on_roll modifiers "
-            f"{sum(entry[1] for entry in ctx_roll_mods):+d} from {parts} -> total={total}"
-        )
+        ctx_mod_total = sum(entry[1] for entry in ctx_roll_mods)
+        total += ctx_mod_total
+        if log is not None:
+            parts = ", ".join(
+                f"{entry[0]}:{engine.card_names.get(entry[0], '?')} {entry[1]:+d}"
+                for entry in ctx_roll_mods
+            )
+            log.append(
+                f"[ROLL:{roll_reason}] P{roller_pid} on_roll modifiers "
+                f"{ctx_mod_total:+d} from {parts} -> total={total}"
+            )
 
     roller = state.players[roller_pid]
+    roller.expire_roll_modifiers(state.turn)
     if roller.roll_modifiers:
-        roller.roll_modifiers = [
-            entry
-            for entry in roller.roll_modifiers
-            if entry[2] is None or entry[2] >= state.turn
-        ]
-    if roller.roll_modifiers:
-        total += sum(entry[1] for entry in roller.roll_modifiers)
-        parts = ", ".join(
-            f"{entry[0]}:{engine.card_meta.get(entry[0], {}).get('name', '?')} {entry[1]:+d}"
-            for entry in roller.roll_modifiers
-        )
-        log.append(
-            f"[ROLL:{roll_reason}] P{roller_pid} passive modifiers "
-            f"{sum(entry[1] for entry in roller.roll_modifiers):+d} from {parts} -> total={total}"
-        )
-
-    used_by_player = set()
-    ordered = [pid for pid in range(len(state.players)) if pid != roller_pid] + [roller_pid]
-
-    def improvement_score_before_after(before: int, after: int, pid: int) -> int:
-        if mode == "maximize":
-            return (after - before) if pid == roller_pid else (before - after)
-
-        if not goal:
-            return 0
-
-        op, target = goal
-        before_ok = goal_satisfied(before, op, target)
-        after_ok = goal_satisfied(after, op, target)
+        passive_mod_total = sum(entry[1] for entry in roller.roll_modifiers)
+        total += passive_mod_total
+        if log is not None:
+            parts = ", ".join(
+                f"{entry[0]}:{engine.card_names.get(entry[0], '?')} {entry[1]:+d}"
+                for entry in roller.roll_modifiers
+            )
+            log.append(
+                f"[ROLL:{roll_reason}] P{roller_pid} passive modifiers "
+                f"{passive_mod_total:+d} from {parts} -> total={total}"
+            )
 
-        if before_ok == after_ok:
-            return 0
+    modifier_ids = engine.modifier_card_ids
+    # Opponents in ascending pid order (unchanged from before) get the first chance to respond;
+    # the roller answers last. This is not the turn-order opponents_ring, on purpose.
+    # Each pid appears once, so nobody can play modifiers twice on the same roll.
+    ordered = itertools.chain(range(roller_pid), range(roller_pid + 1, len(state.players)), (roller_pid,))
 
-        if pid == roller_pid:
-            if (not before_ok) and after_ok:
-                return 1000 + abs(after - before)
-            return (after - before if op == ">=" else before - after)
-        else:
-            if before_ok and (not after_ok):
-                return 1000 + abs(after - before)
-            return (before - after if op == ">=" else after - before)
+    improvement_score_before_after = _improvement_scorer(mode, goal, roller_pid)
 
     for pid in ordered:
-        if pid in used_by_player:
-            continue
-
         player = state.players[pid]
-        mods = find_modifier_cards(player, engine.card_meta)
+        mods = find_modifier_cards(player, modifier_ids)
         if not mods:
             continue
 
-        sources: List[Tuple[str, int, Optional[int], List[int]]] = []
+        sources: List[Tuple[str, int, Optional[int], Tuple[int, ...]]] = []
         for mid in mods:
-            deltas = engine.modifier_options_by_card_id.get(mid, [])
+            deltas = engine.modifier_options_by_card_id.get(mid, ())
             if deltas:
                 sources.append(("card", mid, None, deltas))
+        if not sources:
+            continue
+        if (
+            mode != "maximize"
+            and _goal_outcome_fixed(total, goal, sources)
+            and all(
+                policy.modifier_choice_cost([(source_type, source_id, source_card_id, 0)], engine) >= 0
+                for source_type, source_id, source_card_id, _ in sources
+            )
+        ):
+            # No reachable total flips the goal and every card costs something, so no
+            # combination can score above zero.
+            continue
 
+        # Fewest-cards choice list per reachable total delta; keyed by delta, so the state
+        # space stays bounded by the delta range rather than growing with each card.
         states: dict[int, List[Tuple[str, int, Optional[int], int]]] = {0: []}
         for source_type, source_id, source_card_id, deltas in sources:
             updated = dict(states)
             for current_delta, choices in states.items():
+                next_len = len(choices) + 1
                 for d in deltas:
                     next_delta = current_delta + d
-                    next_choices = choices + [(source_type, source_id, source_card_id, d)]
                     existing = updated.get(next_delta)
-                    if existing is None or len(next_choices) < len(existing):
-                        updated[next_delta] = next_choices
+                    if existing is None or next_len < len(existing):
+                        updated[next_delta] = choices + [(source_type, source_id, source_card_id, d)]
             states = updated
 
         best_score = 0.0
@@ -192,11 +243,12 @@ def resolve_roll_event(
             if source_type == "card":
                 player.hand.remove(source_id)
                 state.discard_pile.append(source_id)
-                played_name = engine.card_meta.get(source_id, {}).get("name", "?")
-                log.append(
-                    f"[ROLL:{roll_reason}] P{pid} plays modifier {source_id} "
-                    f"({played_name}) choose {chosen_delta:+d} -> total={total + chosen_delta}"
-                )
+                if log is not None:
+                    played_name = engine.card_names.get(source_id, "?")
+                    log.append(
+                        f"[ROLL:{roll_reason}] P{pid} plays modifier {source_id} "
+                        f"({played_name}) choose {chosen_delta:+d} -> total={total + chosen_delta}"
+                    )
                 ctx = {
                     "roll_player": roller_pid,
                     "modifier_player": pid,
@@ -204,14 +256,10 @@ def resolve_roll_event(
                 }
                 for owner in state.players:
                     for mid in owner.captured_monsters:
-                        for step in engine.monster_effects.get(mid, []):
-                            if "on_modifier_played" in step.triggers():
-                                from .effects import resolve_effect
-
-                                resolve_effect(step, state, engine, owner.pid, ctx, rng, policy, log)
+                        for step in engine.monster_trigger_steps(mid, "on_modifier_played"):
+                            _effect_resolver()(step, state, engine, owner.pid, ctx, rng, policy, log)
             total += chosen_delta
 
-        used_by_player.add(pid)
-
-    log.append(f"[ROLL:{roll_reason}] FINAL total = {total}")
+    if log is not None:
+        log.append(f"[ROLL:{roll_reason}] FINAL total = {total}")
     return total
@@ -46,18 +46,22 @@ CARD_BASE_VALUES: Dict[str, int] = {
 }
 
 
+_ROLL_MODIFIER_KINDS = frozenset({"modify_roll", "modify_hero_roll"})
+_TIMED_TRIGGERS = frozenset({"on_activation", "on_play"})
+
+
 def _effect_value(step: EffectStep) -> float:
-    kind = str(step.effect_kind or "").strip().lower()
+    kind = step.kind.lower()
     base = EFFECT_KIND_VALUES.get(kind, 1.5)
 
     amount = step.amount if step.amount is not None else 0
-    if kind in ("modify_roll", "modify_hero_roll"):
+    if kind in _ROLL_MODIFIER_KINDS:
         base += min(6, abs(amount)) * 2.5 if amount else 1.5
     elif amount:
         base += min(8, abs(amount)) * 0.8
 
     triggers = step.triggers()
-    if any(t in ("on_activation", "on_play") for t in triggers):
+    if not _TIMED_TRIGGERS.isdisjoint(triggers):
         base += 1.5
     if "passive" in triggers:
         base += 1.0
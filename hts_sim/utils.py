@@ -1,21 +1,40 @@
-from typing import Dict, List, Optional, TYPE_CHECKING
+import re
+import sys
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Tuple, TypeVar, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .models import PlayerState
 
+EFFECT_INT_RE = re.compile(r"[-+]?\d+")
 
-def find_challenge_card_in_hand(player: "PlayerState", card_meta: Dict[int, Dict[str, str]]) -> Optional[int]:
+T = TypeVar("T")
+
+
+def normalize_card_text(value: Any) -> str:
+    """Stripped, lower-cased and interned form of a card type/subtype field."""
+    return sys.intern(str(value).strip().lower())
+
+
+def find_challenge_card_in_hand(player: "PlayerState", challenge_ids: AbstractSet[int]) -> Optional[int]:
     for cid in player.hand:
-        if str(card_meta.get(cid, {}).get("type", "")).strip().lower() == "challenge":
+        if cid in challenge_ids:
             return cid
     return None
 
 
-def find_modifier_cards(player: "PlayerState", card_meta: Dict[int, Dict[str, str]]) -> List[int]:
-    return [cid for cid in player.hand if str(card_meta.get(cid, {}).get("type", "")).lower() == "modifier"]
+def find_modifier_cards(player: "PlayerState", modifier_ids: AbstractSet[int]) -> List[int]:
+    return [cid for cid in player.hand if cid in modifier_ids]
+
+
+def first_in_order(scored: List[Tuple[float, T]], key: Callable[[Tuple[float, T]], Any]) -> Tuple[float, T]:
+    """Same pair as sorted(scored, key=key)[0], without sorting when the scores are NaN-free."""
+    if any(score != score for score, _ in scored):
+        # NaN keys make min() and sort() disagree; keep the sort so diverged policies stay reproducible.
+        return sorted(scored, key=key)[0]
+    return min(scored, key=key)
 
 
-def format_card_list(card_ids: List[int], card_meta: Dict[int, Dict[str, str]]) -> str:
+def format_card_list(card_ids: List[int], card_labels: Dict[int, str]) -> str:
     if not card_ids:
         return "—"
-    return ", ".join(f"{cid}:{card_meta.get(cid, {}).get('name','?')}" for cid in card_ids)
+    return ", ".join(card_labels.get(cid) or f"{cid}:?" for cid in card_ids)
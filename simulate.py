@@ -43,12 +43,14 @@ def _parse_args() -> argparse.Namespace:
     train_parser.add_argument("--transitions-in", type=str, default=None)
     train_parser.add_argument("--transitions-out", type=str, default=None)
     train_parser.add_argument("--replay-epochs", type=int, default=1)
+    train_parser.add_argument("--workers", type=int, default=1)
 
     eval_parser = subparsers.add_parser("evaluate", help="Compare baseline vs tuned policy")
     eval_parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3, 4, 5])
     eval_parser.add_argument("--turns", type=int, default=100)
     eval_parser.add_argument("--players", type=int, default=4)
     eval_parser.add_argument("--weights", type=str, default="policy_weights.json")
+    eval_parser.add_argument("--workers", type=int, default=1)
 
     return parser.parse_args()
 
@@ -68,6 +70,7 @@ def main() -> None:
             weights_path=args.output,
             replay_data=existing_transitions,
             replay_epochs=args.replay_epochs,
+            workers=args.workers,
         )
         print(f"Saved weights to {args.output}. Collected {len(transitions)} transitions.")
         if args.transitions_out:
@@ -83,6 +86,7 @@ def main() -> None:
             turns=args.turns,
             n_players=args.players,
             tuned_policy=tuned,
+            workers=args.workers,
         )
         print("Evaluation results:", results)
         return
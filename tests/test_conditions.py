@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from hts_sim.conditions import eval_condition, is_condition_supported
+
+
+def test_eval_condition_dotted_names_and_contains():
+    ctx = {"challenge_target": {"type": "item"}, "attack.success": True, "classes": ["Bard", "Wizard"]}
+
+    assert eval_condition("challenge_target.type == 'item' and attack.success", ctx)
+    assert eval_condition("classes.contains('bard')", ctx)
+    assert not eval_condition("not attack.success or challenge_target.type != 'item'", ctx)
+    assert eval_condition("", ctx)
+
+
+def test_unsupported_conditions_warn_and_fail():
+    ctx = {}
+
+    assert not eval_condition("roll < 5", ctx)
+    assert ctx["_warnings"] == ["UNPARSEABLE_CONDITION: roll < 5"]
+    assert not is_condition_supported("foo(1)")
+    # Unsupported nodes only fail when reached.
+    assert is_condition_supported("false and (a < b)")
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from hts_sim.game_helpers import (
+    check_party_has_classes,
+    collect_party_classes,
+    parse_attack_requirements,
+)
+from hts_sim.models import Engine, PlayerState
+
+
+def test_parse_attack_requirements_count_class_format():
+    assert parse_attack_requirements("2 (Any) 1 (Thief)") == {"any": 2, "thief": 1}
+
+
+def test_parse_attack_requirements_key_value_format():
+    assert parse_attack_requirements("any: 3, wizard: 1") == {"any": 3, "wizard": 1}
+
+
+def test_parse_attack_requirements_dict_passthrough():
+    assert parse_attack_requirements({" Fighter ": 1}) == {"fighter": 1}
+
+
+def test_check_party_has_classes_matches_collected_classes():
+    engine = Engine(
+        effects_by_card={},
+        card_meta={
+            1: {"id": 1, "type": "hero", "subtype": "Wizard", "name": "Hero One"},
+            2: {"id": 2, "type": "hero", "subtype": "Thief", "name": "Hero Two"},
+            3: {"id": 3, "type": "party_leader", "subtype": "Fighter", "name": "Leader"},
+        },
+        monster_attack_rules={},
+        monster_effects={},
+        modifier_options_by_card_id={},
+    )
+    player = PlayerState(pid=0, party=[1, 2], party_leader=3)
+
+    assert check_party_has_classes(engine, player, frozenset({"wizard", "fighter"}))
+    assert not check_party_has_classes(engine, player, frozenset({"wizard", "bard"}))
+    collect_party_classes(engine, player)
+    assert check_party_has_classes(engine, player, frozenset({"thief", "fighter"}))
+    player.party.remove(2)
+    assert not check_party_has_classes(engine, player, frozenset({"thief"}))
+
+
+def test_expire_roll_modifiers_drops_only_expired_entries():
+    player = PlayerState(pid=0, roll_modifiers=[(10, 1, None), (11, 2, 3), (12, -1, 5)])
+    mods = player.roll_modifiers
+
+    player.expire_roll_modifiers(3)
+    assert mods == [(10, 1, None), (11, 2, 3), (12, -1, 5)]
+    player.expire_roll_modifiers(4)
+    assert mods == [(10, 1, None), (12, -1, 5)]
+    player.expire_roll_modifiers(6)
+    assert player.roll_modifiers is mods
+    assert mods == [(10, 1, None)]
+
+
+def test_add_roll_modifier_expires_after_min_expiry_was_cached():
+    player = PlayerState(pid=0)
+    player.add_roll_modifier(10, 1, None)
+    player.expire_roll_modifiers(1)
+
+    player.add_roll_modifier(11, 2, 3)
+    player.expire_roll_modifiers(4)
+    assert player.roll_modifiers == [(10, 1, None)]
@@ -8,22 +8,30 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 from hts_sim.models import ActionCandidate, Engine, GameState, PlayerState, Policy
 
 
-def _engine():
+def _engine(tuning_values=None):
+    card_meta = {
+        1: {"id": 1, "type": "hero", "subtype": "wizard", "action_cost": 1, "name": "Hero One"},
+        2: {"id": 2, "type": "monster", "subtype": "", "action_cost": 2, "name": "Monster A"},
+        3: {"id": 3, "type": "magic", "subtype": "", "action_cost": 1, "name": "Magic"},
+    }
+    for card_id, value in (tuning_values or {}).items():
+        card_meta[card_id]["tuning_value"] = value
     return Engine(
         effects_by_card={},
-        card_meta={
-            1: {"id": 1, "type": "hero", "subtype": "wizard", "action_cost": 1, "name": "Hero One"},
-            2: {"id": 2, "type": "monster", "subtype": "", "action_cost": 2, "name": "Monster A"},
-            3: {"id": 3, "type": "magic", "subtype": "", "action_cost": 1, "name": "Magic"},
-        },
+        card_meta=card_meta,
         monster_attack_rules={},
         monster_effects={},
         modifier_options_by_card_id={},
     )
 
 
-def test_play_features_add_party_class_score():
-    engine = _engine()
+@pytest.fixture(scope="module")
+def engine():
+    # The engine's card tables are fixed at construction; tests needing other card data call _engine().
+    return _engine()
+
+
+def test_play_features_add_party_class_score(engine):
     player = PlayerState(pid=0, hand=[1], party=[])
     state = GameState(players=[player], draw_pile=[])
     action = ActionCandidate(kind="play_card", cost=1, card_id=1)
@@ -36,8 +44,7 @@ def test_play_features_add_party_class_score():
     assert policy.score_action(action, state, engine, pid=0) == 3.0
 
 
-def test_attack_features_include_urgency_and_value():
-    engine = _engine()
+def test_attack_features_include_urgency_and_value(engine):
     player = PlayerState(pid=0, hand=[], party=[], captured_monsters=[99])
     state = GameState(players=[player], draw_pile=[], monster_row=[2])
     action = ActionCandidate(kind="attack_monster", cost=2, monster_id=2)
@@ -51,9 +58,25 @@ def test_attack_features_include_urgency_and_value():
 
 
 def test_score_card_value_uses_tuning_value():
-    engine = _engine()
-    engine.card_meta[1]["tuning_value"] = 123
+    engine = _engine(tuning_values={1: 123})
 
     policy = Policy()
 
     assert policy.score_card_value(1, engine) == 123
+
+
+def test_score_actions_matches_score_action(engine):
+    player = PlayerState(pid=0, hand=[1, 3], party=[], captured_monsters=[99])
+    state = GameState(players=[player], draw_pile=[5, 6], monster_row=[2])
+    actions = [
+        ActionCandidate(kind="attack_monster", cost=2, monster_id=2),
+        ActionCandidate(kind="play_card", cost=1, card_id=1),
+        ActionCandidate(kind="play_card", cost=1, card_id=3),
+        ActionCandidate(kind="draw", cost=1),
+    ]
+
+    policy = Policy()
+
+    assert policy.score_actions(actions, state, engine, pid=0) == [
+        policy.score_action(action, state, engine, pid=0) for action in actions
+    ]